@@ -1,12 +1,68 @@
+from bisect import bisect_right
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
-import toml
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
 
 ListStr = List[str]
 DEFAULT_MAX_PAGINATION_PAGES = 1000
-DEFAULT_PAGINATION_LIMIT = 100
+DEFAULT_PAGINATION_LIMIT = 1000
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_STATE_SAVE_INTERVAL = 300
+# about the most sequences the URL-length cap (exporter.MAX_QUERY_CHARS) admits for 8-digit sequences
+DEFAULT_ACK_BATCH_SIZE = 200
+DEFAULT_HEALTH_CHECK_INTERVAL = 60
+# ranges up to this many sequences are expanded into individual values
+_EXPAND_RANGE_LIMIT = 64
+
+
+class SequenceSet:
+    """Excluded sequences: individual values plus inclusive (lo, hi) ranges kept unexpanded.
+
+    Ranges are merged and sorted so membership is a bisect over their start values.
+    """
+
+    __slots__ = ("singletons", "ranges", "_starts")
+
+    def __init__(self, singletons: Iterable[int] = (), ranges: Iterable[Tuple[int, int]] = ()):
+        self.singletons: FrozenSet[int] = frozenset(singletons)
+        merged: List[Tuple[int, int]] = []
+        for lo, hi in sorted(ranges):
+            if merged and lo <= merged[-1][1] + 1:
+                if hi > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], hi)
+            else:
+                merged.append((lo, hi))
+        self.ranges: Tuple[Tuple[int, int], ...] = tuple(merged)
+        self._starts: List[int] = [lo for lo, _ in merged]
+
+    def __contains__(self, seq: int) -> bool:
+        return seq in self.singletons or self._in_ranges(seq)
+
+    def _in_ranges(self, seq: int) -> bool:
+        i = bisect_right(self._starts, seq) - 1
+        return i >= 0 and self.ranges[i][1] >= seq
+
+    def remove_from(self, seqs: Iterable[int]) -> Set[int]:
+        """Return seqs as a set without the excluded sequences."""
+        remaining = set(seqs)
+        remaining.difference_update(self.singletons)
+        if self.ranges:
+            remaining = {s for s in remaining if not self._in_ranges(s)}
+        return remaining
+
+    def __bool__(self) -> bool:
+        return bool(self.singletons or self.ranges)
+
+    def __or__(self, other: "SequenceSet") -> "SequenceSet":
+        return SequenceSet(self.singletons | other.singletons, self.ranges + other.ranges)
+
+
+_NO_SEQUENCES = SequenceSet()
 
 
 class ChainConfig:
@@ -53,7 +109,7 @@ class ChainConfig:
 
 class ExcludedSequences:
     def __init__(self, raw: Dict[str, Any]):
-        self.map: Dict[str, Dict[str, set[int]]] = {}
+        self.map: Dict[str, Dict[str, SequenceSet]] = {}
         for key, value in raw.items():
             if not isinstance(key, str) or not key:
                 raise ValueError("excluded_sequences keys must be non-empty strings")
@@ -74,33 +130,41 @@ class ExcludedSequences:
         if not isinstance(seqs, list):
             raise ValueError(f"excluded_sequences.{chain_id}.{channel} must be a list")
         parsed: List[int] = []
+        ranges: List[Tuple[int, int]] = []
         for s in seqs:
             if isinstance(s, str) and '-' in s:
                 start, end = map(int, s.split('-', 1))
                 if start <= 0 or end <= 0 or start > end:
                     raise ValueError(f"Invalid excluded sequence range {s!r} for {chain_id}/{channel}")
-                parsed.extend(range(start, end + 1))
+                if end - start < _EXPAND_RANGE_LIMIT:
+                    parsed.extend(range(start, end + 1))
+                else:
+                    ranges.append((start, end))
             else:
                 seq = int(s)
                 if seq <= 0:
                     raise ValueError(f"Invalid excluded sequence {s!r} for {chain_id}/{channel}")
                 parsed.append(seq)
-        self.map.setdefault(chain_id, {})[channel] = set(parsed)
+        self.map.setdefault(chain_id, {})[channel] = SequenceSet(parsed, ranges)
+
+    def get(self, channel: str, chain_id: str | None = None) -> SequenceSet:
+        """Return every sequence excluded on a channel, including legacy wildcard entries."""
+        wildcard = self.map.get("*", {}).get(channel, _NO_SEQUENCES)
+        scoped = self.map.get(chain_id, {}).get(channel, _NO_SEQUENCES) if chain_id else _NO_SEQUENCES
+        if scoped and wildcard:
+            return scoped | wildcard
+        return scoped or wildcard
 
     def is_excluded(self, channel: str, seq: int, chain_id: str | None = None) -> bool:
-        if chain_id and seq in self.map.get(chain_id, {}).get(channel, set()):
+        if chain_id and seq in self.map.get(chain_id, {}).get(channel, _NO_SEQUENCES):
             return True
-        return seq in self.map.get("*", {}).get(channel, set())
+        return seq in self.map.get("*", {}).get(channel, _NO_SEQUENCES)
 
 
 class Config:
     def __init__(self, path: Path):
-        try:
-            import tomli
-            with open(path, 'rb') as f:
-                data = tomli.load(f)
-        except ImportError:
-            data = toml.load(path)
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
         raw_chains = data.get('chains', [])
         if not isinstance(raw_chains, list):
             raise ValueError('chains must be a list of chain tables')
@@ -121,6 +185,8 @@ class Config:
         )
 
         self.chains: List[ChainConfig] = []
+        self.counterparty_chains: List[ChainConfig] = []
+        home: Optional[ChainConfig] = None
         excluded_sequences_by_chain: Dict[str, Dict[str, List[Any]]] = {}
         seen_chain_ids: set[str] = set()
         for c in raw_chains:
@@ -145,44 +211,50 @@ class Config:
                 raise ValueError(f"{chain_id}.excluded_sequences must be a table")
             if chain_excluded_sequences:
                 excluded_sequences_by_chain[chain_id] = chain_excluded_sequences
-            self.chains.append(
-                ChainConfig(
-                    name=name,
-                    chain_id=chain_id,
-                    rpcs=self._endpoint_list(c.get('rpcs', []), f"{chain_id}.rpcs"),
-                    rests=self._endpoint_list(c.get('rests', []), f"{chain_id}.rests"),
-                    whitelist_clients=self._str_list(c.get('whitelist_clients', []), f"{chain_id}.whitelist_clients"),
-                    blacklist_clients=self._str_list(c.get('blacklist_clients', []), f"{chain_id}.blacklist_clients"),
-                    whitelist_connections=self._str_list(c.get('whitelist_connections', []), f"{chain_id}.whitelist_connections"),
-                    blacklist_connections=self._str_list(c.get('blacklist_connections', []), f"{chain_id}.blacklist_connections"),
-                    whitelist_channels=self._str_list(c.get('whitelist_channels', []), f"{chain_id}.whitelist_channels"),
-                    blacklist_channels=self._str_list(c.get('blacklist_channels', []), f"{chain_id}.blacklist_channels"),
-                    state_refresh_interval=state_refresh_interval,
-                    state_scan_timeout=state_scan_timeout,
-                    home_chain=c.get('home_chain', False),
-                    max_pagination_pages=self._positive_int(
-                        c.get('max_pagination_pages', DEFAULT_MAX_PAGINATION_PAGES),
-                        f"{chain_id}.max_pagination_pages",
-                    ),
-                    pagination_limit=self._positive_int(
-                        c.get('pagination_limit', DEFAULT_PAGINATION_LIMIT),
-                        f"{chain_id}.pagination_limit",
-                    ),
-                    omit_closed_channels=self._bool(
-                        c.get('omit_closed_channels', omit_closed_channels),
-                        f"{chain_id}.omit_closed_channels",
-                    ),
-                    omit_inactive_clients=self._bool(
-                        c.get('omit_inactive_clients', omit_inactive_clients),
-                        f"{chain_id}.omit_inactive_clients",
-                    ),
-                    excluded_sequences=chain_excluded_sequences,
-                )
+            chain = ChainConfig(
+                name=name,
+                chain_id=chain_id,
+                rpcs=self._endpoint_list(c.get('rpcs', []), f"{chain_id}.rpcs"),
+                rests=self._endpoint_list(c.get('rests', []), f"{chain_id}.rests"),
+                whitelist_clients=self._str_list(c.get('whitelist_clients', []), f"{chain_id}.whitelist_clients"),
+                blacklist_clients=self._str_list(c.get('blacklist_clients', []), f"{chain_id}.blacklist_clients"),
+                whitelist_connections=self._str_list(c.get('whitelist_connections', []), f"{chain_id}.whitelist_connections"),
+                blacklist_connections=self._str_list(c.get('blacklist_connections', []), f"{chain_id}.blacklist_connections"),
+                whitelist_channels=self._str_list(c.get('whitelist_channels', []), f"{chain_id}.whitelist_channels"),
+                blacklist_channels=self._str_list(c.get('blacklist_channels', []), f"{chain_id}.blacklist_channels"),
+                state_refresh_interval=state_refresh_interval,
+                state_scan_timeout=state_scan_timeout,
+                home_chain=c.get('home_chain', False),
+                max_pagination_pages=self._positive_int(
+                    c.get('max_pagination_pages', DEFAULT_MAX_PAGINATION_PAGES),
+                    f"{chain_id}.max_pagination_pages",
+                ),
+                pagination_limit=self._positive_int(
+                    c.get('pagination_limit', DEFAULT_PAGINATION_LIMIT),
+                    f"{chain_id}.pagination_limit",
+                ),
+                omit_closed_channels=self._bool(
+                    c.get('omit_closed_channels', omit_closed_channels),
+                    f"{chain_id}.omit_closed_channels",
+                ),
+                omit_inactive_clients=self._bool(
+                    c.get('omit_inactive_clients', omit_inactive_clients),
+                    f"{chain_id}.omit_inactive_clients",
+                ),
+                excluded_sequences=chain_excluded_sequences,
             )
-        home = [c for c in self.chains if c.home_chain]
-        if len(home) != 1:
+            self.chains.append(chain)
+            if chain.home_chain:
+                if home is not None:
+                    raise ValueError(
+                        f"Exactly one chain must be marked as home_chain (found {home.chain_id} and {chain_id})"
+                    )
+                home = chain
+            else:
+                self.counterparty_chains.append(chain)
+        if home is None:
             raise ValueError('Exactly one chain must be marked as home_chain')
-        self.home_chain = home[0]
+        self.home_chain = home
         if not self.home_chain.rests:
             raise ValueError(f"Home chain {self.home_chain.chain_id} must define at least one valid REST endpoint")
         self.excluded_sequences = ExcludedSequences(excluded_sequences_by_chain)
@@ -207,6 +279,40 @@ class Config:
         )
         self.omit_closed_channels = omit_closed_channels
         self.omit_inactive_clients = omit_inactive_clients
+        self.background_scan = self._bool(
+            exporter.get('background_scan', True),
+            'exporter.background_scan',
+        )
+        self.max_workers = self._positive_int(
+            exporter.get('max_workers', DEFAULT_MAX_WORKERS),
+            'exporter.max_workers',
+        )
+        cycle_budget = exporter.get('cycle_budget_seconds')
+        self.cycle_budget = (
+            self._positive_int(cycle_budget, 'exporter.cycle_budget_seconds') if cycle_budget is not None else None
+        )
+        client_state_ttl = exporter.get('client_state_ttl_seconds')
+        self.client_state_ttl = (
+            self._positive_int(client_state_ttl, 'exporter.client_state_ttl_seconds')
+            if client_state_ttl is not None
+            else None
+        )
+        self.health_check_interval = self._positive_int(
+            exporter.get('health_check_interval_seconds', DEFAULT_HEALTH_CHECK_INTERVAL),
+            'exporter.health_check_interval_seconds',
+        )
+        self.ack_batch_size = self._positive_int(
+            exporter.get('ack_batch_size', DEFAULT_ACK_BATCH_SIZE),
+            'exporter.ack_batch_size',
+        )
+        state_file = exporter.get('state_file')
+        self.state_file = (
+            Path(self._optional_str(state_file, 'exporter.state_file')) if state_file is not None else None
+        )
+        self.state_save_interval = self._positive_int(
+            exporter.get('state_save_interval_seconds', DEFAULT_STATE_SAVE_INTERVAL),
+            'exporter.state_save_interval_seconds',
+        )
 
     @staticmethod
     def _required_str(data: Dict[str, Any], key: str) -> str:
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
+import json
+import os
+import threading
 import time
 import logging
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import repeat
 from urllib.parse import quote_plus
-from decimal import Decimal, InvalidOperation
 from prometheus_client import start_http_server
-from ibc_monitor.rest_client import RESTClient
-from ibc_monitor.config import Config, ChainConfig
+from ibc_monitor.rest_client import DEFAULT_QUERY_TIMEOUT, RESTClient
+from ibc_monitor.config import (
+    DEFAULT_ACK_BATCH_SIZE,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_PAGINATION_LIMIT,
+    DEFAULT_STATE_SAVE_INTERVAL,
+    Config,
+    ChainConfig,
+)
 from ibc_monitor.state_scanner import (
     ACTIVE_CLIENT_STATUSES,
     StateScanner,
@@ -28,83 +42,271 @@ from ibc_monitor.metrics import (
     UPDATE_DURATION,
     UPDATE_ERRORS,
 )
+import calendar
 import datetime
-import re
 
 logger = logging.getLogger(__name__)
 
-DURATION_RE = re.compile(r"^(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?$")
-SECONDS_DURATION_RE = re.compile(r"^(\d+(?:\.\d+)?)s$")
+_POOL_LOCK = threading.Lock()
+
+# listings with fewer pages left than this walk next_key instead of fanning out by offset
+_PARALLEL_PAGES_MIN = 3
+
+# gauge value for a timestamp that could not be determined
+_UNKNOWN = float("nan")
+
+# unit -> (rank, seconds); units must appear in h, m, s order
+_DURATION_UNITS = {"h": (2, 3600), "m": (1, 60), "s": (0, 1)}
 
+@lru_cache(maxsize=1024)
 def parse_duration(dur: str) -> int:
+    """Parse protobuf/Go style durations ('1209600s', '1.5s', '336h0m0s') to seconds.
+
+    Clients on a chain share a handful of trusting periods, so results are memoized.
+    """
     dur = (dur or "").strip()
     if not dur:
         return 0
-    seconds_match = SECONDS_DURATION_RE.fullmatch(dur)
-    if seconds_match:
-        try:
-            return int(Decimal(seconds_match.group(1)))
-        except InvalidOperation:
+    # fast path: protobuf Duration JSON is almost always plain '<seconds>s'
+    secs = dur[:-1]
+    if dur[-1] == "s" and secs.isascii() and secs.isdigit():
+        return int(secs)
+    whole, dot, frac = dur.partition(".")
+    if dot:
+        # fractional values are only accepted in the plain '<seconds>.<frac>s' form
+        digits = frac[:-1]
+        if frac[-1:] == "s" and whole.isascii() and whole.isdigit() and digits.isascii() and digits.isdigit():
+            return int(whole)
+        return 0
+    total = 0
+    value = -1
+    rank = 3
+    for ch in dur:
+        if "0" <= ch <= "9":
+            value = (value if value >= 0 else 0) * 10 + ord(ch) - 48
+            continue
+        unit = _DURATION_UNITS.get(ch)
+        if unit is None or value < 0 or unit[0] >= rank:
             return 0
-    m = DURATION_RE.fullmatch(dur)
-    if not m or not any(m.groups()):
+        rank = unit[0]
+        total += value * unit[1]
+        value = -1
+    if value >= 0:
         return 0
-    hours = int(m.group(1) or 0)
-    minutes = int(m.group(2) or 0)
-    seconds = int(m.group(3) or 0)
-    return hours * 3600 + minutes * 60 + seconds
+    return total
 
 # RFC3339 (with arbitrary fractional seconds) -> epoch seconds
-_TS_TZ_RE = re.compile(r"^(?P<prefix>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?P<frac>\.\d+)?(?P<tz>Z|[+\-]\d{2}:\d{2})$")
-
 def _parse_rfc3339_to_epoch(ts: str) -> int | None:
     """
     Parse timestamps like '2025-08-11T11:02:48.284737546+00:00' or with 'Z'.
-    We trim fractional seconds to microseconds since datetime.fromisoformat
-    only supports up to 6 digits.
+    Fractional seconds are dropped; the fixed-width date/time fields and the UTC
+    offset are sliced out directly, range-checked and turned into an epoch with
+    calendar.timegm. Invalid dates return None.
     """
     if not ts:
         return None
     try:
-        m = _TS_TZ_RE.match(ts.replace("z", "Z"))
-        if not m:
-            # last resort: try replacing trailing 'Z' and drop fractional part entirely
-            t = ts.replace("Z", "+00:00")
-            if "." in t:
-                base, rest = t.split(".", 1)
-                if "+" in rest:
-                    _, tz = rest.split("+", 1)
-                    t = f"{base}+{tz}"
-                elif "-" in rest:
-                    _, tz = rest.split("-", 1)
-                    t = f"{base}-{tz}"
-            return int(datetime.datetime.fromisoformat(t).timestamp())
-        prefix = m.group("prefix")
-        frac = (m.group("frac") or "")
-        tz = m.group("tz")
-        if tz == "Z":
-            tz = "+00:00"
-        if frac:
-            # keep up to 6 digits (microseconds), right-pad if needed
-            digits = frac[1:]
-            digits = (digits[:6]).ljust(6, "0")
-            ts_norm = f"{prefix}.{digits}{tz}"
+        n = len(ts)
+        if n >= 20 and ts[-1] in "Zz":
+            core_end, tz_off = n - 1, 0
+        elif n >= 25 and ts[-6] in "+-" and ts[-3] == ":":
+            off_h, off_m = int(ts[-5:-3]), int(ts[-2:])
+            if not (0 <= off_h < 24 and 0 <= off_m < 60):
+                raise ValueError("UTC offset out of range")
+            core_end, tz_off = n - 6, off_h * 3600 + off_m * 60
+            if ts[-6] == "-":
+                tz_off = -tz_off
         else:
-            ts_norm = f"{prefix}{tz}"
-        return int(datetime.datetime.fromisoformat(ts_norm).timestamp())
+            core_end = 0
+        if (
+            core_end >= 19
+            and ts[4] == "-" and ts[7] == "-" and ts[10] in "Tt" and ts[13] == ":" and ts[16] == ":"
+            and (core_end == 19 or (ts[19] == "." and ts[20:core_end].isdigit()))
+        ):
+            year, month, day = int(ts[0:4]), int(ts[5:7]), int(ts[8:10])
+            hour, minute, second = int(ts[11:13]), int(ts[14:16]), int(ts[17:19])
+            # timegm normalizes out-of-range fields instead of rejecting them
+            if not (
+                1 <= month <= 12
+                and 1 <= day <= calendar.monthrange(year, month)[1]
+                and 0 <= hour < 24 and 0 <= minute < 60 and 0 <= second < 60
+            ):
+                raise ValueError("date/time field out of range")
+            return calendar.timegm((year, month, day, hour, minute, second, 0, 0, 0)) - tz_off
+        # last resort: cut the fractional digits out and let fromisoformat handle the rest
+        i = ts.find(".")
+        if i >= 0:
+            j = i + 1
+            while j < n and "0" <= ts[j] <= "9":
+                j += 1
+            ts = ts[:i] + ts[j:]
+        if ts[-1:] in ("Z", "z"):
+            ts = ts[:-1] + "+00:00"
+        return int(datetime.datetime.fromisoformat(ts).timestamp())
     except Exception as e:
         logger.debug("Failed to parse RFC3339 timestamp '%s': %s", ts, e)
         return None
 
-BATCH = 100  # sequences per filtered-ack/unreceived_acks request
-
-def _chunked(seqs):
-    seqs = list(seqs)
-    for i in range(0, len(seqs), BATCH):
-        yield seqs[i:i+BATCH]
+# keep sequence-list query strings under common 8 KiB request-line limits
+MAX_QUERY_CHARS = 7500
+
+def _chunked(seqs, size: int):
+    seqs = seqs if isinstance(seqs, list) else list(seqs)
+    if len(seqs) <= size:
+        return (seqs,)
+    return [seqs[i:i+size] for i in range(0, len(seqs), size)]
+
+def _url_batch_size(key: str, seqs, size: int) -> int:
+    """Cap a batch size so that repeated key=<seq> parameters stay within MAX_QUERY_CHARS."""
+    if not seqs:
+        return size
+    per_item = len(key) + 2 + len(str(max(seqs)))
+    fits = max(1, MAX_QUERY_CHARS // per_item)
+    if fits < size:
+        logger.debug("Capping %s batch at %d sequences to bound URL length (configured %d)", key, fits, size)
+        return fits
+    return size
+
+def _budget_timeout(deadline: float | None, timeout: float) -> float:
+    """Cap a request timeout at the time left before a monotonic deadline (None: no deadline)."""
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("update cycle budget exhausted")
+    return min(timeout, remaining)
+
+@lru_cache(maxsize=4096)
+def _channel_path(port: str, channel: str) -> str:
+    """URL-quoted channel prefix; built once per (port, channel) instead of on every query."""
+    return f"/ibc/core/channel/v1/channels/{quote_plus(channel)}/ports/{quote_plus(port)}"
 
 def _params_repeat(key: str, values):
-    return "&".join(f"{key}={quote_plus(str(v))}" for v in values)
+    """Repeat key=<value> for integer sequences; decimal digits never need URL quoting."""
+    if not values:
+        return ""
+    return f"{key}=" + f"&{key}=".join(map(str, values))
+
+class PendingSequences:
+    """
+    Pending sequence -> first-seen timestamp, stored as two parallel arrays.
+    seqs is kept sorted, so the oldest (smallest) sequence and its timestamp
+    are always at index 0.
+    """
+    __slots__ = ("seqs", "times")
+
+    def __init__(self):
+        self.seqs = array("q")
+        self.times = array("q")
+
+    def __len__(self) -> int:
+        return len(self.seqs)
+
+    def __iter__(self):
+        return iter(self.seqs)
+
+    def __contains__(self, seq) -> bool:
+        i = bisect_left(self.seqs, seq)
+        return i < len(self.seqs) and self.seqs[i] == seq
+
+    def __getitem__(self, seq) -> int:
+        i = bisect_left(self.seqs, seq)
+        if i < len(self.seqs) and self.seqs[i] == seq:
+            return self.times[i]
+        raise KeyError(seq)
+
+    @property
+    def oldest(self) -> int:
+        return self.seqs[0] if self.seqs else 0
+
+    @property
+    def oldest_ts(self) -> int:
+        return self.times[0] if self.times else 0
+
+    @classmethod
+    def from_arrays(cls, seqs, times) -> "PendingSequences":
+        pending = cls()
+        for seq, ts in sorted(zip(seqs, times)):
+            if not pending.seqs or pending.seqs[-1] != seq:
+                pending.seqs.append(seq)
+                pending.times.append(ts)
+        return pending
+
+    def reconcile(self, current, now: int) -> None:
+        """Drop sequences missing from current and stamp new ones with now."""
+        if not current:
+            if self.seqs:
+                self.seqs, self.times = array("q"), array("q")
+            return
+        new_seqs = array("q", sorted(current if isinstance(current, (set, frozenset)) else set(current)))
+        old_seqs, old_times = self.seqs, self.times
+        if new_seqs == old_seqs:
+            return
+        # common case: sequences clear from the low end and new ones append at the top,
+        # so the surviving tail of the old arrays is a prefix of the new ones
+        k = bisect_left(old_seqs, new_seqs[0])
+        kept = len(old_seqs) - k
+        if kept <= len(new_seqs) and old_seqs[k:] == new_seqs[:kept]:
+            new_times = old_times[k:]
+            new_times.extend(repeat(now, len(new_seqs) - kept))
+            self.seqs, self.times = new_seqs, new_times
+            return
+        # carry over first-seen times and stamp new sequences without a Python-level loop
+        first_seen = dict(zip(old_seqs, old_times))
+        self.seqs, self.times = new_seqs, array("q", map(first_seen.get, new_seqs, repeat(now)))
+
+
+_NO_PENDING = PendingSequences()
+_NO_SEQS = frozenset()
+
+STATE_VERSION = 1
+
+
+def _dump_pending(pending_by_key):
+    return [[list(key), list(p.seqs), list(p.times)] for key, p in pending_by_key.items() if p]
+
+
+def _load_pending(rows):
+    return {tuple(key): PendingSequences.from_arrays(seqs, times) for key, seqs, times in rows}
+
+# order matters: _record_send_backlog / _record_ack_backlog unpack the bound children by position
+_BACKLOG_METRICS = (
+    BACKLOG_SIZE,
+    BACKLOG_OLDEST_SEQ,
+    BACKLOG_OLDEST_TIMESTAMP,
+    ACK_BACKLOG_SIZE,
+    ACK_OLDEST_SEQ,
+    ACK_OLDEST_TIMESTAMP,
+)
+
+
+class _UpdateCycle:
+    """Per-cycle state shared by the client and channel workers of update_metrics."""
+
+    def __init__(self, now: int):
+        self.now = now
+        self.health_by_chain = {}
+        self.active_labelsets = set()
+        self.active_client_status_labelsets = set()
+        self.active_channel_state_labelsets = set()
+        self.failed_backlog_chains = set()
+        # client_id -> client_state from one list query, when that is cheaper than per-client queries
+        self.home_client_states = None
+        # monotonic time after which unfinished work is abandoned (None: no budget)
+        self.deadline = None
+        # metric, error-count, cache and pending-state writes queued by workers; the update
+        # thread applies them once their wave has finished in budget, so abandoned work
+        # publishes nothing
+        self._writes = []
+
+    def publish(self, fn, *args) -> None:
+        self._writes.append((fn, args))
+
+    def commit(self) -> None:
+        writes, self._writes = self._writes, []
+        for fn, args in writes:
+            fn(*args)
+
 
 class IBCExporter:
     def __init__(self, cfg: Config):
@@ -112,9 +314,13 @@ class IBCExporter:
 
         # Determine home chain and counterparties from config
         self.home_chain_cfg: ChainConfig = cfg.home_chain
-        self.cp_chain_cfgs = [c for c in cfg.chains if not c.home_chain]
+        self.cp_chain_cfgs = cfg.counterparty_chains
         self.cp_chain_ids = [c.chain_id for c in self.cp_chain_cfgs]
 
+        # requests to one chain can come from both the I/O pool and the page pool at once;
+        # size the keep-alive pool for both so no connection is opened just to be discarded
+        pool_maxsize = 2 * cfg.max_workers
+
         # Build one REST client for the home chain
         if not self.home_chain_cfg.rests:
             raise ValueError(f"No REST endpoints configured for home chain {self.home_chain_cfg.chain_id}")
@@ -124,6 +330,8 @@ class IBCExporter:
             self.home_chain_cfg.name,
             fallback_endpoints=self.home_chain_cfg.rests[1:],
             enable_chain_registry_fallbacks=self.cfg.enable_chain_registry_fallbacks,
+            pool_maxsize=pool_maxsize,
+            health_ttl=cfg.health_check_interval,
         )
 
         # Build REST clients for counterparties (one per chain)
@@ -142,8 +350,19 @@ class IBCExporter:
                 c.name,
                 fallback_endpoints=c.rests[1:],
                 enable_chain_registry_fallbacks=self.cfg.enable_chain_registry_fallbacks,
+                pool_maxsize=pool_maxsize,
+                health_ttl=cfg.health_check_interval,
             )
 
+        # shared pool for the independent per-client / per-channel REST work
+        self._io_pool = ThreadPoolExecutor(
+            max_workers=cfg.max_workers,
+            thread_name_prefix="ibc-exporter",
+        )
+        self._page_pool = None
+        # close() shuts the pools down for good; the scanner keeps a reference to _io_pool
+        self._closed = False
+
         # Single scanner rooted at the *home* chain; scanner itself will explicitly query CPs.
         self.scanner = StateScanner(
             client=self.home_client,
@@ -152,26 +371,47 @@ class IBCExporter:
             rest_by_chain=self.rest_by_chain,
             home_chain_id=self.home_chain_cfg.chain_id,
             cp_chain_cfgs={c.chain_id: c for c in self.cp_chain_cfgs},
+            # scans run on the update thread or the scanner's own thread, never inside an _io_pool task
+            executor=self._io_pool,
         )
 
         # in-memory tracking
         # key: (chain_id, conn, port, channel) -> {seq: first_seen_ts}
         self.pending_packets = {}
         self.pending_acks = {}
-        self._rest_health_labelsets = set()
+        self._rest_health_gauges = {}
+        self._chain_gauge_cache = {}
+        self._backlog_gauge_cache = {}
+        self._client_gauge_cache = {}
         self._backlog_labelsets = set()
         self._client_status_labelsets = set()
         self._channel_state_labelsets = set()
+        self._last_state_save = time.monotonic()
+        self._load_state()
+        # (chain_id, client_id) -> ((revision_number, revision_height), consensus epoch)
+        self._consensus_ts_cache = {}
+        # (chain_id, client_id) -> (monotonic fetch time, client_state)
+        self._client_state_cache = {}
 
     # -------- helpers --------
 
     @staticmethod
-    def _page_path(path: str, next_key: str | None, limit: int | None) -> str:
+    def _page_path(
+        path: str,
+        next_key: str | None,
+        limit: int | None,
+        offset: int | None = None,
+        count_total: bool = False,
+    ) -> str:
         params = []
         if next_key:
             params.append(f"pagination.key={quote_plus(next_key)}")
+        if offset:
+            params.append(f"pagination.offset={offset}")
         if limit:
             params.append(f"pagination.limit={limit}")
+        if count_total:
+            params.append("pagination.count_total=true")
         if not params:
             return path
         return f"{path}{'&' if '?' in path else '?'}{'&'.join(params)}"
@@ -182,19 +422,70 @@ class IBCExporter:
         path: str,
         list_key: str,
         timeout: int | None = None,
+        limit: int | None = None,
+        item_key: str | None = None,
+        deadline: float | None = None,
     ):
-        items = []
-        next_key = None
-        seen_next_keys = set()
-        pages = 0
-        limit = getattr(self.cfg, "pagination_limit", None)
+        """
+        Collect every item of a paginated list endpoint.
+
+        This is a best-effort snapshot, not a consistent read: the list can change
+        between page requests. Long listings fetch their remaining pages by offset in
+        parallel, and an insert or delete can shift items across those pages. With
+        item_key, the merged result is de-duplicated on that field. An item that moved
+        to an already-fetched page can still be missed until the next cycle.
+        With a monotonic deadline, every page request is cut short at it.
+        """
+        limit = limit or getattr(self.cfg, "pagination_limit", None)
         max_pages = getattr(self.cfg, "max_pagination_pages", 1000)
+        timeout = timeout or DEFAULT_QUERY_TIMEOUT
+
+        def fetch(page_path):
+            return client.query(page_path, timeout=_budget_timeout(deadline, timeout))
+
+        res = fetch(self._page_path(path, None, limit))
+        items = list(res.get(list_key, []) or [])
+        next_key = (res.get("pagination") or {}).get("next_key")
+        page_size = len(items)
+        if not next_key or not page_size:
+            return items
+
+        # more than one page: ask for the total (count_total makes the node count every entry,
+        # so single-page listings never pay for it); the LCD only honours it with an offset
+        if max_pages < 2:
+            raise RuntimeError(f"Exceeded max pages for {path}")
+        res = fetch(self._page_path(path, None, page_size, offset=page_size, count_total=True))
+        items.extend(res.get(list_key, []) or [])
+        pagination = res.get("pagination") or {}
+        next_key = pagination.get("next_key")
+        if not next_key:
+            return self._dedup_items(items, item_key)
+        try:
+            total = int(pagination.get("total") or 0)
+        except (TypeError, ValueError):
+            total = 0
+
+        offsets = range(2 * page_size, total, page_size)
+        if len(offsets) >= _PARALLEL_PAGES_MIN:
+            # long listing: fetch the remaining pages by offset, in parallel
+            if len(offsets) + 2 > max_pages:
+                raise RuntimeError(f"Exceeded max pages for {path}")
+            pages = self._page_executor().map(
+                lambda offset: fetch(self._page_path(path, None, page_size, offset=offset)),
+                offsets,
+            )
+            for page in pages:
+                items.extend(page.get(list_key, []) or [])
+            return self._dedup_items(items, item_key)
+
+        # a few pages left (or no usable total): walk next_key sequentially
+        seen_next_keys = {next_key}
+        pages = 2
         while True:
             pages += 1
             if pages > max_pages:
                 raise RuntimeError(f"Exceeded max pages for {path}")
-            qpath = self._page_path(path, next_key, limit)
-            res = client.query(qpath, timeout=timeout or 3)
+            res = fetch(self._page_path(path, next_key, limit))
             items.extend(res.get(list_key, []) or [])
             next_key = (res.get("pagination") or {}).get("next_key")
             if not next_key:
@@ -202,10 +493,30 @@ class IBCExporter:
             if next_key in seen_next_keys:
                 raise RuntimeError(f"Repeated pagination.next_key for {path}")
             seen_next_keys.add(next_key)
-        return items
+        return self._dedup_items(items, item_key)
+
+    @staticmethod
+    def _dedup_items(items: list, item_key: str | None) -> list:
+        """Drop repeated items (by item_key) that shifted across offset pages."""
+        if not item_key:
+            return items
+        seen = set()
+        unique = []
+        for item in items:
+            key = item.get(item_key) if isinstance(item, dict) else item
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(item)
+        return unique
 
     @staticmethod
     def _parse_sequences(items, channel: str):
+        try:
+            # well-formed pages convert in one pass; only malformed ones need the per-item checks
+            return [int(item["sequence"]) for item in items]
+        except (KeyError, TypeError, ValueError):
+            pass
         seqs = []
         for item in items:
             try:
@@ -215,14 +526,24 @@ class IBCExporter:
         return seqs
 
     def _set_rest_health(self, chain_id: str, endpoint: str, healthy: bool) -> None:
-        if not hasattr(self, "_rest_health_labelsets"):
-            self._rest_health_labelsets = set()
         endpoint = endpoint or "unavailable"
-        for old_chain_id, old_endpoint in list(self._rest_health_labelsets):
-            if old_chain_id == chain_id and old_endpoint != endpoint:
-                REST_HEALTH.labels(chain_id=old_chain_id, endpoint=old_endpoint).set(0)
-        REST_HEALTH.labels(chain_id=chain_id, endpoint=endpoint).set(1 if healthy else 0)
-        self._rest_health_labelsets.add((chain_id, endpoint))
+        # chain_id -> {endpoint: bound REST_HEALTH child}
+        gauges = self._rest_health_gauges.setdefault(chain_id, {})
+        gauge = gauges.get(endpoint)
+        if gauge is None:
+            gauge = gauges[endpoint] = REST_HEALTH.labels(chain_id=chain_id, endpoint=endpoint)
+        for old_endpoint, old_gauge in gauges.items():
+            if old_endpoint != endpoint:
+                old_gauge.set(0)
+        gauge.set(1 if healthy else 0)
+
+    def _chain_gauges(self, chain_id: str):
+        """Return the bound (backlog updated, update duration) children for a chain."""
+        gauges = self._chain_gauge_cache.get(chain_id)
+        if gauges is None:
+            gauges = (BACKLOG_UPDATED.labels(chain_id=chain_id), UPDATE_DURATION.labels(chain_id=chain_id))
+            self._chain_gauge_cache[chain_id] = gauges
+        return gauges
 
     @staticmethod
     def _metric_labels_tuple(
@@ -244,55 +565,46 @@ class IBCExporter:
             counterparty_channel_id,
         )
 
-    @staticmethod
-    def _metric_labels_dict(label_values):
-        return dict(
-            chain_id=label_values[0],
-            connection_id=label_values[1],
-            port_id=label_values[2],
-            channel_id=label_values[3],
-            counterparty_chain_id=label_values[4],
-            counterparty_port_id=label_values[5],
-            counterparty_channel_id=label_values[6],
-        )
+    def _backlog_gauges(self, label_values):
+        """Return the bound backlog children for a channel, binding them on first use."""
+        gauges = self._backlog_gauge_cache.get(label_values)
+        if gauges is None:
+            gauges = tuple(metric.labels(*label_values) for metric in _BACKLOG_METRICS)
+            self._backlog_gauge_cache[label_values] = gauges
+        return gauges
+
+    def _client_gauges(self, client_id: str, chain_id: str, counterparty_chain_id: str, counterparty_client_id: str):
+        """Return the bound (trusting period, last update) children for a client."""
+        key = (client_id, chain_id, counterparty_chain_id, counterparty_client_id)
+        gauges = self._client_gauge_cache.get(key)
+        if gauges is None:
+            gauges = (CLIENT_TRUSTING_PERIOD.labels(*key), CLIENT_LAST_UPDATE.labels(*key))
+            self._client_gauge_cache[key] = gauges
+        return gauges
 
     def _record_send_backlog(self, label_values, pending_key, valid_seqs, now: int) -> None:
-        pending = self.pending_packets.setdefault(pending_key, {})
-        valid_seq_set = set(valid_seqs)
-        for s in list(pending.keys()):
-            if s not in valid_seq_set:
-                del pending[s]
-        for s in valid_seqs:
-            if s not in pending:
-                pending[s] = now
-
-        size = len(pending)
-        oldest_seq = min(pending) if pending else 0
-        oldest_ts = pending.get(oldest_seq, 0)
-        labels = self._metric_labels_dict(label_values)
-        BACKLOG_SIZE.labels(**labels).set(size)
-        BACKLOG_OLDEST_SEQ.labels(**labels).set(oldest_seq)
-        BACKLOG_OLDEST_TIMESTAMP.labels(**labels).set(oldest_ts)
+        pending = self.pending_packets.get(pending_key)
+        if pending is None:
+            pending = self.pending_packets[pending_key] = PendingSequences()
+        pending.reconcile(valid_seqs, now)
+
+        size_gauge, oldest_seq_gauge, oldest_ts_gauge = self._backlog_gauges(label_values)[:3]
+        size_gauge.set(len(pending))
+        oldest_seq_gauge.set(pending.oldest)
+        oldest_ts_gauge.set(pending.oldest_ts)
 
     def _record_ack_backlog(self, label_values, pending_key, unreceived, now: int) -> None:
-        apending = self.pending_acks.setdefault(pending_key, {})
-        for s in list(apending.keys()):
-            if s not in unreceived:
-                del apending[s]
-        for s in unreceived:
-            if s not in apending:
-                apending[s] = now
-
-        aoldest_seq = min(apending) if apending else 0
-        aoldest_ts = apending.get(aoldest_seq, 0)
-        labels = self._metric_labels_dict(label_values)
-        ACK_BACKLOG_SIZE.labels(**labels).set(len(apending))
-        ACK_OLDEST_SEQ.labels(**labels).set(aoldest_seq)
-        ACK_OLDEST_TIMESTAMP.labels(**labels).set(aoldest_ts)
+        apending = self.pending_acks.get(pending_key)
+        if apending is None:
+            apending = self.pending_acks[pending_key] = PendingSequences()
+        apending.reconcile(unreceived, now)
+
+        size_gauge, oldest_seq_gauge, oldest_ts_gauge = self._backlog_gauges(label_values)[3:]
+        size_gauge.set(len(apending))
+        oldest_seq_gauge.set(apending.oldest)
+        oldest_ts_gauge.set(apending.oldest_ts)
 
     def _remove_stale_labelsets(self, metric, attr_name: str, active_labelsets) -> None:
-        if not hasattr(self, attr_name):
-            setattr(self, attr_name, set())
         previous = getattr(self, attr_name)
         for label_values in previous - active_labelsets:
             try:
@@ -317,35 +629,20 @@ class IBCExporter:
             counterparty_client_id,
             status or "unknown",
         )
-        CLIENT_STATUS.labels(
-            client_id=client_id,
-            chain_id=chain_id,
-            counterparty_chain_id=counterparty_chain_id,
-            counterparty_client_id=counterparty_client_id,
-            status=status or "unknown",
-        ).set(1)
+        CLIENT_STATUS.labels(*label_values).set(1)
         active_labelsets.add(label_values)
 
     def _record_channel_state(self, active_labelsets, label_values, state: str) -> None:
-        state = state or "unknown"
-        labels = self._metric_labels_dict(label_values)
-        labels["state"] = state
-        CHANNEL_STATE.labels(**labels).set(1)
-        active_labelsets.add(tuple(label_values) + (state,))
+        # label_values follow the metric's label order, so bind positionally
+        state_labels = tuple(label_values) + (state or "unknown",)
+        CHANNEL_STATE.labels(*state_labels).set(1)
+        active_labelsets.add(state_labels)
 
     def _remove_stale_backlog_metrics(self, active_labelsets) -> None:
-        if not hasattr(self, "_backlog_labelsets"):
-            self._backlog_labelsets = set()
         stale_labelsets = self._backlog_labelsets - active_labelsets
         for label_values in stale_labelsets:
-            for metric in (
-                BACKLOG_SIZE,
-                BACKLOG_OLDEST_SEQ,
-                BACKLOG_OLDEST_TIMESTAMP,
-                ACK_BACKLOG_SIZE,
-                ACK_OLDEST_SEQ,
-                ACK_OLDEST_TIMESTAMP,
-            ):
+            self._backlog_gauge_cache.pop(label_values, None)
+            for metric in _BACKLOG_METRICS:
                 try:
                     metric.remove(*label_values)
                 except KeyError:
@@ -354,10 +651,31 @@ class IBCExporter:
 
     @staticmethod
     def _pending_summary(pending, now: int):
-        oldest_seq = min(pending) if pending else 0
-        oldest_ts = pending.get(oldest_seq, 0)
+        oldest_seq = pending.oldest
+        oldest_ts = pending.oldest_ts
         return oldest_seq, oldest_ts, now - oldest_ts if oldest_ts else 0
 
+    def _log_backlog_summary(self, chain_id: str, port: str, channel: str, pending_key, now: int) -> None:
+        # per-channel line on every cycle; skip the lookups entirely unless INFO is on
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        pending = self.pending_packets.get(pending_key, _NO_PENDING)
+        apending = self.pending_acks.get(pending_key, _NO_PENDING)
+        oldest_seq, _, oldest_age = self._pending_summary(pending, now)
+        aoldest_seq, _, aoldest_age = self._pending_summary(apending, now)
+        logger.info(
+            "[%s %s/%s] backlog=%d oldest=%d age=%ds ack_backlog=%d ack_oldest=%d ack_age=%ds",
+            chain_id,
+            port,
+            channel,
+            len(pending),
+            oldest_seq,
+            oldest_age,
+            len(apending),
+            aoldest_seq,
+            aoldest_age,
+        )
+
     @staticmethod
     def _query_client_status(rc: RESTClient, client_id: str, timeout: int) -> str:
         res = rc.query(
@@ -366,14 +684,31 @@ class IBCExporter:
         )
         return normalize_ibc_enum(res.get("status"), "STATUS_")
 
-    def _filtered_ack_sequences(self, client: RESTClient, port: str, channel: str, seqs):
+    def _filtered_ack_sequences(
+        self,
+        client: RESTClient,
+        port: str,
+        channel: str,
+        seqs,
+        deadline: float | None = None,
+    ):
         acked = set()
         if not seqs:
             return acked
-        base = f"/ibc/core/channel/v1/channels/{quote_plus(channel)}/ports/{quote_plus(port)}/packet_acknowledgements"
-        for batch in _chunked(seqs):
-            q = _params_repeat("packet_commitment_sequences", batch)
-            res = client.query(f"{base}?{q}")
+        base = f"{_channel_path(port, channel)}/packet_acknowledgements"
+        key = "packet_commitment_sequences"
+        size = _url_batch_size(key, seqs, getattr(self.cfg, "ack_batch_size", DEFAULT_ACK_BATCH_SIZE))
+        batches = _chunked(seqs, size)
+
+        def fetch(batch):
+            return client.query(
+                f"{base}?{_params_repeat(key, batch)}",
+                timeout=_budget_timeout(deadline, DEFAULT_QUERY_TIMEOUT),
+            )
+
+        # several batches are independent lookups: issue them concurrently on the leaf pool
+        responses = map(fetch, batches) if len(batches) == 1 else self._page_executor().map(fetch, batches)
+        for res in responses:
             for a in res.get("acknowledgements", []) or []:
                 try:
                     acked.add(int(a.get("sequence", 0)))
@@ -381,46 +716,76 @@ class IBCExporter:
                     continue
         return acked
 
-    def _unreceived_acks(self, client: RESTClient, port: str, channel: str, ack_seqs):
-        unreceived = set()
-        if not ack_seqs:
-            return unreceived
-
-        base = f"/ibc/core/channel/v1/channels/{quote_plus(channel)}/ports/{quote_plus(port)}/packet_commitments/{{seqs}}/unreceived_acks"
-        for batch in _chunked(ack_seqs):
-            seqs_seg = ",".join(str(s) for s in batch)
-            res = client.query(base.format(seqs=quote_plus(seqs_seg)))
-            for s in res.get("sequences", []) or []:
-                try:
-                    unreceived.add(int(s))
-                except (TypeError, ValueError):
-                    continue
-        return unreceived
+    def _cached_client_state(self, chain_id: str, client_id: str) -> dict | None:
+        """Return a client_state fetched within exporter.client_state_ttl_seconds, if any."""
+        ttl = getattr(self.cfg, "client_state_ttl", None)
+        if not ttl:
+            return None
+        cached = self._client_state_cache.get((chain_id, client_id))
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        return None
 
-    # ---- consensus timestamp helpers ----
+    def _cache_client_state(self, chain_id: str, client_id: str, client_state: dict) -> None:
+        if not getattr(self.cfg, "client_state_ttl", None):
+            return
+        self._client_state_cache[(chain_id, client_id)] = (time.monotonic(), client_state)
+
+    def _client_state(self, rc: RESTClient, cycle: _UpdateCycle, chain_id: str, client_id: str) -> dict:
+        """Fetch a client_state, reusing it for exporter.client_state_ttl_seconds when configured."""
+        client_state = self._cached_client_state(chain_id, client_id)
+        if client_state is not None:
+            return client_state
+        cs = rc.query(
+            f"/ibc/core/client/v1/client_states/{client_id}",
+            timeout=_budget_timeout(cycle.deadline, DEFAULT_QUERY_TIMEOUT),
+        )
+        client_state = cs.get("client_state") or {}
+        cycle.publish(self._cache_client_state, chain_id, client_id, client_state)
+        return client_state
 
-    def _latest_consensus_timestamp(self, rc: RESTClient, client_id: str, now: int) -> int | None:
-        # 1) via latest_height from client_state
+    def _latest_consensus_timestamp(
+        self,
+        rc: RESTClient,
+        client_id: str,
+        cycle: _UpdateCycle,
+        client_state: dict | None = None,
+        chain_id: str | None = None,
+    ) -> int | None:
+        def timeout():
+            return _budget_timeout(cycle.deadline, DEFAULT_QUERY_TIMEOUT)
+
+        # 1) via latest_height from client_state (reuse the caller's copy when it already has one)
         try:
-            cs = rc.query(f"/ibc/core/client/v1/client_states/{client_id}")
-            st = (cs.get("client_state") or {})
-            h = (st.get("latest_height") or {})
+            if client_state is None:
+                cs = rc.query(f"/ibc/core/client/v1/client_states/{client_id}", timeout=timeout())
+                client_state = cs.get("client_state") or {}
+            h = (client_state.get("latest_height") or {})
             rev = h.get("revision_number")
             hei = h.get("revision_height")
             if rev is not None and hei is not None:
+                # the consensus state at a given height never changes, so only
+                # query it again once the client has been updated
+                cache_key = (chain_id, client_id)
+                cached = self._consensus_ts_cache.get(cache_key) if chain_id else None
+                if cached is not None and cached[0] == (rev, hei):
+                    return cached[1]
                 res = rc.query(
-                    f"/ibc/core/client/v1/consensus_states/{client_id}/revision/{rev}/height/{hei}"
+                    f"/ibc/core/client/v1/consensus_states/{client_id}/revision/{rev}/height/{hei}",
+                    timeout=timeout(),
                 )
                 ts = ((res.get("consensus_state") or {}).get("timestamp") or "")
                 epoch = _parse_rfc3339_to_epoch(ts)
                 if epoch is not None:
+                    if chain_id:
+                        cycle.publish(self._consensus_ts_cache.__setitem__, cache_key, ((rev, hei), epoch))
                     return epoch
         except Exception as e:
             logger.debug("latest consensus by client_state.latest_height failed for %s: %s", client_id, e)
 
         # 2) fallback: list endpoint -> pick the highest height
         try:
-            res = rc.query(f"/ibc/core/client/v1/consensus_states/{client_id}")
+            res = rc.query(f"/ibc/core/client/v1/consensus_states/{client_id}", timeout=timeout())
             lst = res.get("consensus_states")
             if isinstance(lst, list) and lst:
                 def _hkey(el):
@@ -442,103 +807,206 @@ class IBCExporter:
         # 3) last resort -> unknown
         return None
 
+    def _load_state(self) -> None:
+        """Restore pending first-seen timestamps written by a previous run."""
+        path = getattr(self.cfg, "state_file", None)
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != STATE_VERSION:
+                logger.warning("Ignoring state file %s with unsupported version %s", path, data.get("version"))
+                return
+            self.pending_packets = _load_pending(data.get("pending_packets", []))
+            self.pending_acks = _load_pending(data.get("pending_acks", []))
+            logger.info(
+                "Restored %d packet and %d ack backlog(s) from %s",
+                len(self.pending_packets),
+                len(self.pending_acks),
+                path,
+            )
+        except Exception as e:
+            logger.warning("Failed to load state file %s: %s", path, e)
+
+    def save_state(self) -> None:
+        """Write pending first-seen timestamps to the configured state file."""
+        path = getattr(self.cfg, "state_file", None)
+        if not path:
+            return
+        tmp = f"{path}.tmp"
+        try:
+            data = {
+                "version": STATE_VERSION,
+                "pending_packets": _dump_pending(self.pending_packets),
+                "pending_acks": _dump_pending(self.pending_acks),
+            }
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning("Failed to write state file %s: %s", path, e)
+        self._last_state_save = time.monotonic()
+
+    def _maybe_save_state(self) -> None:
+        if not getattr(self.cfg, "state_file", None):
+            return
+        interval = getattr(self.cfg, "state_save_interval", DEFAULT_STATE_SAVE_INTERVAL)
+        if time.monotonic() - getattr(self, "_last_state_save", 0) >= interval:
+            self.save_state()
+
     def run(self):
         # start prometheus server
         start_http_server(self.cfg.port, addr=self.cfg.address)
-        logger.info(f"Exporter listening on {self.cfg.address}:{self.cfg.port}")
-        while True:
-            self.update_metrics()
-            time.sleep(self.cfg.update_interval)
+        logger.info("Exporter listening on %s:%s", self.cfg.address, self.cfg.port)
+        if getattr(self.cfg, "background_scan", False):
+            self.scanner.start_background()
+        try:
+            while True:
+                self.update_metrics()
+                self._maybe_save_state()
+                time.sleep(self.cfg.update_interval)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Persist state and release the sessions and worker pools shared by every cycle.
+        The exporter cannot run further cycles afterwards.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if getattr(self.cfg, "background_scan", False):
+            # let an in-flight scan finish before its executor is shut down below
+            self.scanner.stop_background(timeout=self.home_chain_cfg.state_scan_timeout)
+        self.save_state()
+        # sessions and pools live for the whole process so keep-alive connections and
+        # worker threads survive across scans and update cycles; release them only on the way out
+        for rc in [self.home_client, *self.rest_by_chain.values()]:
+            rc.close()
+        for attr in ("_io_pool", "_page_pool"):
+            pool = getattr(self, attr, None)
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+                setattr(self, attr, None)
+
+    def __enter__(self) -> "IBCExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     @staticmethod
     def _inc_error(chain_id: str, stage: str) -> None:
         UPDATE_ERRORS.labels(chain_id=chain_id, stage=stage).inc()
 
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._closed:
+            raise RuntimeError("IBCExporter is closed")
+        if getattr(self, "_io_pool", None) is None:
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=getattr(self.cfg, "max_workers", DEFAULT_MAX_WORKERS),
+                thread_name_prefix="ibc-exporter",
+            )
+        return self._io_pool
+
+    def _page_executor(self) -> ThreadPoolExecutor:
+        # separate from _io_pool: page fetches are submitted from _io_pool workers,
+        # and waiting on the same bounded pool from inside it could deadlock
+        if self._closed:
+            raise RuntimeError("IBCExporter is closed")
+        if getattr(self, "_page_pool", None) is None:
+            with _POOL_LOCK:
+                if getattr(self, "_page_pool", None) is None:
+                    self._page_pool = ThreadPoolExecutor(
+                        max_workers=getattr(self.cfg, "max_workers", DEFAULT_MAX_WORKERS),
+                        thread_name_prefix="ibc-exporter-page",
+                    )
+        return self._page_pool
+
+    def _run_parallel(self, fn, tasks, deadline: float | None = None) -> bool:
+        """
+        Run fn(*args) for every args tuple on the I/O pool and wait for all of them.
+        With a monotonic deadline, stop waiting once it passes, cancel tasks that have
+        not started yet and return False.
+        """
+        futures = [self._executor().submit(fn, *args) for args in tasks]
+        if deadline is None:
+            for future in futures:
+                future.result()
+            return True
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        for future in not_done:
+            future.cancel()
+        for future in done:
+            if not future.cancelled():
+                future.result()
+        return not not_done
+
+    def _abort_over_budget(self, chain_id: str, started: float, update_duration) -> None:
+        self._inc_error(chain_id, "budget")
+        logger.warning(
+            "Update cycle for %s exceeded its %ss budget; keeping previous metrics for unfinished work",
+            chain_id,
+            getattr(self.cfg, "cycle_budget", None),
+        )
+        update_duration.set(time.monotonic() - started)
+
     def update_metrics(self):
         started = time.monotonic()
         now = int(time.time())
         home_chain_id = self.home_chain_cfg.chain_id
-        active_labelsets = set()
-        active_client_status_labelsets = set()
-        active_channel_state_labelsets = set()
-        failed_backlog_chains = set()
-        health_by_chain = {}
-
-        # Health checks for home + counterparties
-        try:
-            home_healthy = self.home_client.health()
-        except Exception:
-            logger.exception("Home chain %s health check failed", home_chain_id)
-            self._inc_error(home_chain_id, "health")
-            home_healthy = False
-        health_by_chain[home_chain_id] = home_healthy
-        self._set_rest_health(home_chain_id, self.home_client.endpoint, home_healthy)
-
-        for cid, rc in self.rest_by_chain.items():
-            try:
-                healthy = rc.health()
-            except Exception:
-                logger.exception("Counterparty chain %s health check failed", cid)
-                self._inc_error(cid, "health")
-                healthy = False
-            health_by_chain[cid] = healthy
-            self._set_rest_health(cid, rc.endpoint, healthy)
+        cycle = _UpdateCycle(now)
+        budget = getattr(self.cfg, "cycle_budget", None)
+        if budget:
+            cycle.deadline = started + budget
+        health_by_chain = cycle.health_by_chain
+        update_duration = self._chain_gauges(home_chain_id)[1]
+
+        # Health checks for home + counterparties; a stalled endpoint only costs its own timeout
+        if not self._run_parallel(
+            self._check_chain_health,
+            [(cycle, home_chain_id, self.home_client)]
+            + [(cycle, cid, rc) for cid, rc in self.rest_by_chain.items()],
+            cycle.deadline,
+        ):
+            self._abort_over_budget(home_chain_id, started, update_duration)
+            return
+        cycle.commit()
+        home_healthy = health_by_chain[home_chain_id]
 
         if not home_healthy:
             logger.debug("Home chain %s endpoint unhealthy; skipping scan/metrics this cycle", home_chain_id)
-            UPDATE_DURATION.labels(chain_id=home_chain_id).set(time.monotonic() - started)
+            update_duration.set(time.monotonic() - started)
             return
 
-        # Refresh state (home + explicit CP scans)
-        if not self.scanner.scan():
+        # Refresh state (home + explicit CP scans); a background scanner's first result is
+        # awaited for at most the rest of the cycle budget, or one update interval without one
+        if cycle.deadline is not None:
+            scan_wait = max(0.0, cycle.deadline - time.monotonic())
+        else:
+            scan_wait = self.cfg.update_interval
+        if not self.scanner.scan(timeout=scan_wait):
             self._inc_error(home_chain_id, "scan")
-            UPDATE_DURATION.labels(chain_id=home_chain_id).set(time.monotonic() - started)
+            update_duration.set(time.monotonic() - started)
+            return
+        if cycle.deadline is not None and time.monotonic() >= cycle.deadline:
+            self._abort_over_budget(home_chain_id, started, update_duration)
             return
 
         # -------- client state metrics (home) --------
-        for cid in self.scanner.clients:
-            cp_chain = self.scanner.client_chain_map.get(cid, "")
-            cp_client = self.scanner.client_counterparty_client_ids.get(cid, "")
-            status = getattr(self.scanner, "client_status_map", {}).get(cid, "unknown")
-            self._record_client_status(
-                active_client_status_labelsets,
-                home_chain_id,
-                cid,
-                cp_chain,
-                cp_client,
-                status,
-            )
-            try:
-                cs = self.home_client.query(f"/ibc/core/client/v1/client_states/{cid}")
-                client_state = cs.get('client_state', {}) or {}
-                tp_str = client_state.get('trusting_period', '') or ''
-                tp = parse_duration(tp_str)
-                cp_chain = client_state.get('chain_id', '') or cp_chain
-                CLIENT_TRUSTING_PERIOD.labels(
-                    client_id=cid,
-                    chain_id=home_chain_id,
-                    counterparty_chain_id=cp_chain,
-                    counterparty_client_id=cp_client,
-                ).set(tp)
-
-                last_ts = self._latest_consensus_timestamp(self.home_client, cid, now)
-                if last_ts is not None:
-                    CLIENT_LAST_UPDATE.labels(
-                        client_id=cid,
-                        chain_id=home_chain_id,
-                        counterparty_chain_id=cp_chain,
-                        counterparty_client_id=cp_client,
-                    ).set(last_ts)
-            except Exception as e:
-                self._inc_error(home_chain_id, "client_state")
-                logger.warning("Home client metrics failed for %s: %s", cid, e)
+        cycle.home_client_states = self._home_client_states_batch()
+        client_tasks = [(self._update_home_client, cycle, cid) for cid in self.scanner.clients]
 
         # -------- client state metrics (counterparties) --------
         # Build a set of cp-clients per cp-chain from what we learned on the home chain
         cp_clients_by_chain = {}
+        client_chain_map = self.scanner.client_chain_map
+        client_cp_client_ids = self.scanner.client_counterparty_client_ids
         for local_cid in self.scanner.clients:
-            cp_chain = self.scanner.client_chain_map.get(local_cid, "")
-            cp_client = self.scanner.client_counterparty_client_ids.get(local_cid, "")
+            cp_chain = client_chain_map.get(local_cid, "")
+            cp_client = client_cp_client_ids.get(local_cid, "")
             if cp_chain and cp_client:
                 cp_clients_by_chain.setdefault(cp_chain, set()).add((cp_client, local_cid))  # (cp_client, home_client)
 
@@ -546,246 +1014,311 @@ class IBCExporter:
             rc = self.rest_by_chain.get(cp_chain)
             if not rc or not health_by_chain.get(cp_chain, False):
                 continue
+            client_tasks.extend(
+                (self._update_cp_client, cycle, rc, cp_chain, cp_client, home_client)
+                for cp_client, home_client in pairs
+            )
+        # home and counterparty clients are independent: run them as one wave
+        if not self._run_parallel(lambda update, *args: update(*args), client_tasks, cycle.deadline):
+            self._abort_over_budget(home_chain_id, started, update_duration)
+            return
+        cycle.commit()
+
+        # -------- backlog metrics per channel (home and counterparties) --------
+        # both ends of every channel are independent, so they share one wave of
+        # workers instead of waiting for all home channels before starting
+        channel_tasks = [(self._update_home_channel, ch) for ch in self.scanner.channels]
+        channel_tasks += [(self._update_cp_channel, ch) for ch in self.scanner.cp_channels]
+        if not self._run_parallel(
+            lambda update, ch: update(cycle, ch),
+            channel_tasks,
+            cycle.deadline,
+        ):
+            self._abort_over_budget(home_chain_id, started, update_duration)
+            return
+        cycle.commit()
 
-            for cp_client, home_client in pairs:
-                status = getattr(self.scanner, "cp_client_status_map", {}).get((cp_chain, cp_client))
-                if not status:
-                    try:
-                        status = self._query_client_status(
-                            rc,
-                            cp_client,
-                            self.home_chain_cfg.state_scan_timeout,
-                        )
-                    except Exception as e:
-                        self._inc_error(cp_chain, "client_status")
-                        if getattr(self.cfg, "omit_inactive_clients", False):
-                            logger.warning(
-                                "Counterparty client status failed for %s on %s: %s",
-                                cp_client,
-                                cp_chain,
-                                e,
-                            )
-                            continue
-                        status = "unknown"
-                if getattr(self.cfg, "omit_inactive_clients", False) and status not in ACTIVE_CLIENT_STATUSES:
-                    continue
-                self._record_client_status(
-                    active_client_status_labelsets,
-                    cp_chain,
-                    cp_client,
-                    home_chain_id,
-                    home_client,
-                    status,
-                )
+        active_labelsets = cycle.active_labelsets
+        failed_backlog_chains = cycle.failed_backlog_chains
+        if not failed_backlog_chains:
+            self._remove_stale_backlog_metrics(active_labelsets)
+        else:
+            self._backlog_labelsets |= active_labelsets
+        self._remove_stale_labelsets(
+            CLIENT_STATUS,
+            "_client_status_labelsets",
+            cycle.active_client_status_labelsets,
+        )
+        self._remove_stale_labelsets(
+            CHANNEL_STATE,
+            "_channel_state_labelsets",
+            cycle.active_channel_state_labelsets,
+        )
 
-                # trusting period on the counterparty
-                try:
-                    cs_cp = rc.query(f"/ibc/core/client/v1/client_states/{cp_client}")
-                    cp_state = cs_cp.get("client_state", {}) or {}
-                    tp_str_cp = cp_state.get("trusting_period", "") or ""
-                    tp_cp = parse_duration(tp_str_cp)
-                    CLIENT_TRUSTING_PERIOD.labels(
-                        client_id=cp_client,
-                        chain_id=cp_chain,
-                        counterparty_chain_id=self.home_chain_cfg.chain_id,
-                        counterparty_client_id=home_client,
-                    ).set(tp_cp)
-                except Exception as e:
-                    self._inc_error(cp_chain, "client_state")
-                    logger.debug("cp client_states failed for %s on %s: %s", cp_client, cp_chain, e)
-                    continue
+        for cid, healthy in health_by_chain.items():
+            if healthy and cid not in failed_backlog_chains:
+                self._chain_gauges(cid)[0].set(now)
+        update_duration.set(time.monotonic() - started)
 
-                # last update on the counterparty
-                try:
-                    last_ts_cp = self._latest_consensus_timestamp(rc, cp_client, now)
-                    if last_ts_cp is not None:
-                        CLIENT_LAST_UPDATE.labels(
-                            client_id=cp_client,
-                            chain_id=cp_chain,
-                            counterparty_chain_id=home_chain_id,
-                            counterparty_client_id=home_client,
-                        ).set(last_ts_cp)
-                except Exception as e:
-                    self._inc_error(cp_chain, "client_state")
-                    logger.debug("cp consensus_states failed for %s on %s: %s", cp_client, cp_chain, e)
-
-        # -------- backlog metrics per channel (home) --------
-        for conn, port, channel, cp_port, cp_channel, cp_chain in self.scanner.channels:
-            key_home = (home_chain_id, conn, port, channel)
-            label_values = self._metric_labels_tuple(
-                home_chain_id,
-                conn,
-                port,
-                channel,
-                cp_chain,
-                cp_port,
-                cp_channel,
+        logger.info("Metrics updated")
+
+    def _check_chain_health(self, cycle: _UpdateCycle, chain_id: str, rc: RESTClient) -> None:
+        try:
+            healthy = rc.health(timeout=_budget_timeout(cycle.deadline, DEFAULT_QUERY_TIMEOUT))
+        except Exception:
+            logger.exception("Chain %s health check failed", chain_id)
+            cycle.publish(self._inc_error, chain_id, "health")
+            healthy = False
+        cycle.health_by_chain[chain_id] = healthy
+        cycle.publish(self._set_rest_health, chain_id, rc.endpoint, healthy)
+
+    def _home_client_states_batch(self) -> dict | None:
+        """
+        Fetch every home client_state in one paginated listing when it needs fewer requests
+        than querying the clients whose client_state_ttl_seconds cache entry is stale.
+        """
+        home_chain_id = self.home_chain_cfg.chain_id
+        stale = [cid for cid in self.scanner.clients if self._cached_client_state(home_chain_id, cid) is None]
+        total = getattr(self.scanner, "home_client_count", 0)
+        limit = getattr(self.cfg, "pagination_limit", None) or DEFAULT_PAGINATION_LIMIT
+        if not total or -(-total // limit) >= len(stale):
+            return None
+        try:
+            items = self._query_all_list(
+                self.home_client,
+                "/ibc/core/client/v1/client_states",
+                "client_states",
+                timeout=self.home_chain_cfg.state_scan_timeout,
+                limit=limit,
+                item_key="client_id",
             )
-            self._record_channel_state(
-                active_channel_state_labelsets,
-                label_values,
-                getattr(self.scanner, "channel_state_map", {}).get(key_home, "unknown"),
+        except Exception as e:
+            logger.debug("client_states listing failed on %s; querying clients one by one: %s",
+                         home_chain_id, e)
+            return None
+        states = {c.get("client_id"): c.get("client_state") or {} for c in items}
+        for cid, client_state in states.items():
+            self._cache_client_state(home_chain_id, cid, client_state)
+        return states
+
+    def _update_home_client(self, cycle: _UpdateCycle, cid: str) -> None:
+        home_chain_id = self.home_chain_cfg.chain_id
+        cp_chain = self.scanner.client_chain_map.get(cid, "")
+        cp_client = self.scanner.client_counterparty_client_ids.get(cid, "")
+        status = getattr(self.scanner, "client_status_map", {}).get(cid, "unknown")
+        cycle.publish(
+            self._record_client_status,
+            cycle.active_client_status_labelsets,
+            home_chain_id,
+            cid,
+            cp_chain,
+            cp_client,
+            status,
+        )
+        try:
+            client_state = cycle.home_client_states.get(cid) if cycle.home_client_states else None
+            if client_state is None:
+                client_state = self._client_state(self.home_client, cycle, home_chain_id, cid)
+            tp_str = client_state.get('trusting_period', '') or ''
+            tp = parse_duration(tp_str)
+            cp_chain = client_state.get('chain_id', '') or cp_chain
+            trusting_gauge, last_update_gauge = self._client_gauges(cid, home_chain_id, cp_chain, cp_client)
+            cycle.publish(trusting_gauge.set, tp)
+
+            last_ts = self._latest_consensus_timestamp(
+                self.home_client, cid, cycle, client_state, home_chain_id
             )
+            # NaN marks an unknown last update instead of leaving a stale value behind
+            cycle.publish(last_update_gauge.set, last_ts if last_ts is not None else _UNKNOWN)
+        except Exception as e:
+            cycle.publish(self._inc_error, home_chain_id, "client_state")
+            logger.warning("Home client metrics failed for %s: %s", cid, e)
 
+    def _update_cp_client(
+        self,
+        cycle: _UpdateCycle,
+        rc: RESTClient,
+        cp_chain: str,
+        cp_client: str,
+        home_client: str,
+    ) -> None:
+        home_chain_id = self.home_chain_cfg.chain_id
+        status = getattr(self.scanner, "cp_client_status_map", {}).get((cp_chain, cp_client))
+        if not status:
             try:
-                sp_items = self._query_all_list(
-                    self.home_client,
-                    f"/ibc/core/channel/v1/channels/{channel}/ports/{port}/packet_commitments",
-                    "commitments",
-                    timeout=self.home_chain_cfg.state_scan_timeout,
+                status = self._query_client_status(
+                    rc,
+                    cp_client,
+                    _budget_timeout(cycle.deadline, self.home_chain_cfg.state_scan_timeout),
                 )
-                seqs = self._parse_sequences(sp_items, channel)
-                valid_seqs = [
-                    s for s in seqs
-                    if not self.cfg.excluded_sequences.is_excluded(channel, s, home_chain_id)
-                ]
-                self._record_send_backlog(label_values, key_home, valid_seqs, now)
-                active_labelsets.add(label_values)
             except Exception as e:
-                failed_backlog_chains.add(home_chain_id)
-                self._inc_error(home_chain_id, "backlog")
-                logger.warning("Send backlog query failed for %s/%s on %s: %s", port, channel, home_chain_id, e)
-                continue
+                cycle.publish(self._inc_error, cp_chain, "client_status")
+                if getattr(self.cfg, "omit_inactive_clients", False):
+                    logger.warning(
+                        "Counterparty client status failed for %s on %s: %s",
+                        cp_client,
+                        cp_chain,
+                        e,
+                    )
+                    return
+                status = "unknown"
+        if getattr(self.cfg, "omit_inactive_clients", False) and status not in ACTIVE_CLIENT_STATUSES:
+            return
+        cycle.publish(
+            self._record_client_status,
+            cycle.active_client_status_labelsets,
+            cp_chain,
+            cp_client,
+            home_chain_id,
+            home_client,
+            status,
+        )
 
-            # ---- FAST ACK BACKLOG (home) ----
-            rc = self.rest_by_chain.get(cp_chain)
-            if not valid_seqs:
-                self._record_ack_backlog(label_values, key_home, set(), now)
-            elif rc and health_by_chain.get(cp_chain, False):
-                try:
-                    acked_on_cp = self._filtered_ack_sequences(rc, cp_port, cp_channel, valid_seqs)
-                    unreceived = self._unreceived_acks(self.home_client, port, channel, acked_on_cp)
-                    self._record_ack_backlog(label_values, key_home, unreceived, now)
-                except Exception as e:
-                    failed_backlog_chains.add(home_chain_id)
-                    self._inc_error(home_chain_id, "ack")
-                    logger.warning("Ack backlog query failed for %s/%s on %s: %s", port, channel, home_chain_id, e)
-            else:
-                failed_backlog_chains.add(home_chain_id)
-                self._inc_error(home_chain_id, "ack")
-                logger.warning(
-                    "Ack backlog skipped for %s/%s on %s: counterparty chain %s is unavailable",
-                    port,
-                    channel,
-                    home_chain_id,
-                    cp_chain,
-                )
+        # trusting period on the counterparty
+        try:
+            cp_state = self._client_state(rc, cycle, cp_chain, cp_client)
+            tp_str_cp = cp_state.get("trusting_period", "") or ""
+            tp_cp = parse_duration(tp_str_cp)
+            trusting_gauge, last_update_gauge = self._client_gauges(cp_client, cp_chain, home_chain_id, home_client)
+            cycle.publish(trusting_gauge.set, tp_cp)
+        except Exception as e:
+            cycle.publish(self._inc_error, cp_chain, "client_state")
+            logger.debug("cp client_states failed for %s on %s: %s", cp_client, cp_chain, e)
+            return
 
-            pending = self.pending_packets.get(key_home, {})
-            apending = self.pending_acks.get(key_home, {})
-            oldest_seq, oldest_ts, oldest_age = self._pending_summary(pending, now)
-            aoldest_seq, aoldest_ts, aoldest_age = self._pending_summary(apending, now)
-            logger.info(
-                "[%s %s/%s] backlog=%d oldest=%d age=%ds ack_backlog=%d ack_oldest=%d ack_age=%ds",
-                home_chain_id,
-                port,
-                channel,
-                len(pending),
-                oldest_seq,
-                oldest_age,
-                len(apending),
-                aoldest_seq,
-                aoldest_age,
-            )
+        # last update on the counterparty
+        try:
+            last_ts_cp = self._latest_consensus_timestamp(rc, cp_client, cycle, cp_state, cp_chain)
+            cycle.publish(last_update_gauge.set, last_ts_cp if last_ts_cp is not None else _UNKNOWN)
+        except Exception as e:
+            cycle.publish(self._inc_error, cp_chain, "client_state")
+            logger.debug("cp consensus_states failed for %s on %s: %s", cp_client, cp_chain, e)
 
-        # -------- backlog metrics per channel (counterparties) --------
-        # tuples: (cp_chain, cp_conn, port, channel, cp_port, cp_channel, home_chain_id)
-        for (cp_chain, cp_conn, port, channel, cp_port, cp_channel, home_chain_id) in self.scanner.cp_channels:
-            rc = self.rest_by_chain.get(cp_chain)
-            label_values = self._metric_labels_tuple(
-                cp_chain,
-                cp_conn,
-                port,
-                channel,
-                home_chain_id,
-                cp_port,
-                cp_channel,
-            )
-            self._record_channel_state(
-                active_channel_state_labelsets,
-                label_values,
-                getattr(self.scanner, "cp_channel_state_map", {}).get((cp_chain, cp_conn, port, channel), "unknown"),
-            )
-            if not rc or not health_by_chain.get(cp_chain, False):
-                failed_backlog_chains.add(cp_chain)
-                continue
+    def _update_home_channel(self, cycle: _UpdateCycle, chan) -> None:
+        conn, port, channel, cp_port, cp_channel, cp_chain = chan
+        home_chain_id = self.home_chain_cfg.chain_id
+        now = cycle.now
+        key_home = (home_chain_id, conn, port, channel)
+        label_values = self._metric_labels_tuple(
+            home_chain_id,
+            conn,
+            port,
+            channel,
+            cp_chain,
+            cp_port,
+            cp_channel,
+        )
+        cycle.publish(
+            self._record_channel_state,
+            cycle.active_channel_state_labelsets,
+            label_values,
+            getattr(self.scanner, "channel_state_map", {}).get(key_home, "unknown"),
+        )
 
-            key_cp = (cp_chain, cp_conn, port, channel)
+        try:
+            sp_items = self._query_all_list(
+                self.home_client,
+                f"{_channel_path(port, channel)}/packet_commitments",
+                "commitments",
+                timeout=self.home_chain_cfg.state_scan_timeout,
+                item_key="sequence",
+                deadline=cycle.deadline,
+            )
+            seqs = self._parse_sequences(sp_items, channel)
+            valid_seqs = self.cfg.excluded_sequences.get(channel, home_chain_id).remove_from(seqs)
+            cycle.publish(self._record_send_backlog, label_values, key_home, valid_seqs, now)
+            cycle.publish(cycle.active_labelsets.add, label_values)
+        except Exception as e:
+            cycle.publish(cycle.failed_backlog_chains.add, home_chain_id)
+            cycle.publish(self._inc_error, home_chain_id, "backlog")
+            logger.warning("Send backlog query failed for %s/%s on %s: %s", port, channel, home_chain_id, e)
+            return
 
+        # ---- FAST ACK BACKLOG (home) ----
+        if not valid_seqs:
+            # nothing is committed, so nothing can be waiting for an ack: skip the counterparty
+            cycle.publish(self._record_ack_backlog, label_values, key_home, _NO_SEQS, now)
+        elif cycle.health_by_chain.get(cp_chain, False) and cp_chain in self.rest_by_chain:
+            rc = self.rest_by_chain[cp_chain]
             try:
-                sp_items = self._query_all_list(
-                    rc,
-                    f"/ibc/core/channel/v1/channels/{channel}/ports/{port}/packet_commitments",
-                    "commitments",
-                    timeout=self.home_chain_cfg.state_scan_timeout,
-                )
-                seqs = self._parse_sequences(sp_items, channel)
-                valid_seqs = [
-                    s for s in seqs
-                    if not self.cfg.excluded_sequences.is_excluded(channel, s, cp_chain)
-                ]
-                self._record_send_backlog(label_values, key_cp, valid_seqs, now)
-                active_labelsets.add(label_values)
+                acked_on_cp = self._filtered_ack_sequences(rc, cp_port, cp_channel, valid_seqs, cycle.deadline)
+                # a commitment is deleted once its ack is received, so every sequence still
+                # committed here and acknowledged on the counterparty is an unreceived ack
+                cycle.publish(self._record_ack_backlog, label_values, key_home, acked_on_cp & valid_seqs, now)
             except Exception as e:
-                failed_backlog_chains.add(cp_chain)
-                self._inc_error(cp_chain, "backlog")
-                logger.warning("Send backlog query failed for %s/%s on %s: %s", port, channel, cp_chain, e)
-                continue
-
-            # ---- FAST ACK BACKLOG (counterparty side) ----
-            if not valid_seqs:
-                self._record_ack_backlog(label_values, key_cp, set(), now)
-            else:
-                try:
-                    acked_on_home = self._filtered_ack_sequences(
-                        self.home_client, cp_port, cp_channel, valid_seqs
-                    )
-                    unreceived_cp = self._unreceived_acks(
-                        rc, port, channel, acked_on_home
-                    )
-                    self._record_ack_backlog(label_values, key_cp, unreceived_cp, now)
-                except Exception as e:
-                    failed_backlog_chains.add(cp_chain)
-                    self._inc_error(cp_chain, "ack")
-                    logger.warning("Ack backlog query failed for %s/%s on %s: %s", port, channel, cp_chain, e)
-
-            pending = self.pending_packets.get(key_cp, {})
-            apending = self.pending_acks.get(key_cp, {})
-            oldest_seq, oldest_ts, oldest_age = self._pending_summary(pending, now)
-            aoldest_seq, aoldest_ts, aoldest_age = self._pending_summary(apending, now)
-            logger.info(
-                "[%s %s/%s] backlog=%d oldest=%d age=%ds ack_backlog=%d ack_oldest=%d ack_age=%ds",
-                cp_chain,
+                cycle.publish(cycle.failed_backlog_chains.add, home_chain_id)
+                cycle.publish(self._inc_error, home_chain_id, "ack")
+                logger.warning("Ack backlog query failed for %s/%s on %s: %s", port, channel, home_chain_id, e)
+        else:
+            cycle.publish(cycle.failed_backlog_chains.add, home_chain_id)
+            cycle.publish(self._inc_error, home_chain_id, "ack")
+            logger.warning(
+                "Ack backlog skipped for %s/%s on %s: counterparty chain %s is unavailable",
                 port,
                 channel,
-                len(pending),
-                oldest_seq,
-                oldest_age,
-                len(apending),
-                aoldest_seq,
-                aoldest_age,
+                home_chain_id,
+                cp_chain,
             )
 
-        if not failed_backlog_chains:
-            self._remove_stale_backlog_metrics(active_labelsets)
-        else:
-            if not hasattr(self, "_backlog_labelsets"):
-                self._backlog_labelsets = set()
-            self._backlog_labelsets |= active_labelsets
-        self._remove_stale_labelsets(
-            CLIENT_STATUS,
-            "_client_status_labelsets",
-            active_client_status_labelsets,
+        cycle.publish(self._log_backlog_summary, home_chain_id, port, channel, key_home, now)
+
+    def _update_cp_channel(self, cycle: _UpdateCycle, chan) -> None:
+        # tuples: (cp_chain, cp_conn, port, channel, cp_port, cp_channel, home_chain_id)
+        cp_chain, cp_conn, port, channel, cp_port, cp_channel, home_chain_id = chan
+        now = cycle.now
+        rc = self.rest_by_chain.get(cp_chain)
+        label_values = self._metric_labels_tuple(
+            cp_chain,
+            cp_conn,
+            port,
+            channel,
+            home_chain_id,
+            cp_port,
+            cp_channel,
         )
-        self._remove_stale_labelsets(
-            CHANNEL_STATE,
-            "_channel_state_labelsets",
-            active_channel_state_labelsets,
+        cycle.publish(
+            self._record_channel_state,
+            cycle.active_channel_state_labelsets,
+            label_values,
+            getattr(self.scanner, "cp_channel_state_map", {}).get((cp_chain, cp_conn, port, channel), "unknown"),
         )
+        if not rc or not cycle.health_by_chain.get(cp_chain, False):
+            cycle.publish(cycle.failed_backlog_chains.add, cp_chain)
+            return
 
-        for cid, healthy in health_by_chain.items():
-            if healthy and cid not in failed_backlog_chains:
-                BACKLOG_UPDATED.labels(chain_id=cid).set(now)
-        UPDATE_DURATION.labels(chain_id=home_chain_id).set(time.monotonic() - started)
+        key_cp = (cp_chain, cp_conn, port, channel)
 
-        logger.info("Metrics updated")
+        try:
+            sp_items = self._query_all_list(
+                rc,
+                f"{_channel_path(port, channel)}/packet_commitments",
+                "commitments",
+                timeout=self.home_chain_cfg.state_scan_timeout,
+                item_key="sequence",
+                deadline=cycle.deadline,
+            )
+            seqs = self._parse_sequences(sp_items, channel)
+            valid_seqs = self.cfg.excluded_sequences.get(channel, cp_chain).remove_from(seqs)
+            cycle.publish(self._record_send_backlog, label_values, key_cp, valid_seqs, now)
+            cycle.publish(cycle.active_labelsets.add, label_values)
+        except Exception as e:
+            cycle.publish(cycle.failed_backlog_chains.add, cp_chain)
+            cycle.publish(self._inc_error, cp_chain, "backlog")
+            logger.warning("Send backlog query failed for %s/%s on %s: %s", port, channel, cp_chain, e)
+            return
+
+        # ---- FAST ACK BACKLOG (counterparty side) ----
+        if not valid_seqs:
+            cycle.publish(self._record_ack_backlog, label_values, key_cp, _NO_SEQS, now)
+        else:
+            try:
+                acked_on_home = self._filtered_ack_sequences(
+                    self.home_client, cp_port, cp_channel, valid_seqs, cycle.deadline
+                )
+                cycle.publish(self._record_ack_backlog, label_values, key_cp, acked_on_home & valid_seqs, now)
+            except Exception as e:
+                cycle.publish(cycle.failed_backlog_chains.add, cp_chain)
+                cycle.publish(self._inc_error, cp_chain, "ack")
+                logger.warning("Ack backlog query failed for %s/%s on %s: %s", port, channel, cp_chain, e)
+
+        cycle.publish(self._log_backlog_summary, cp_chain, port, channel, key_cp, now)
@@ -1,6 +1,74 @@
 import fnmatch
+import re
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
 from ibc_monitor.config import ExcludedSequences
 
+
+def compile_globs(patterns: Iterable[str]) -> Optional[Pattern[str]]:
+    """Compile glob patterns into a single regex union, or None if empty."""
+    return _compile_globs(tuple(patterns))
+
+
+@lru_cache(maxsize=64)
+def _compile_globs(patterns: Tuple[str, ...]) -> Optional[Pattern[str]]:
+    # scans rebuild their filters from the same config lists every time: compile each list once
+    translated = [fnmatch.translate(p) for p in patterns]
+    if not translated:
+        return None
+    return re.compile("|".join(f"(?:{t})" for t in translated))
+
+
+def _is_glob(pattern: str) -> bool:
+    return any(ch in pattern for ch in "*?[")
+
+
+class _GlobSet:
+    """Literal IDs as a frozenset, wildcard patterns as one compiled regex."""
+
+    __slots__ = ("exact", "wildcard")
+
+    def __init__(self, patterns: Tuple[str, ...]):
+        self.exact: FrozenSet[str] = frozenset(p for p in patterns if not _is_glob(p))
+        self.wildcard = compile_globs(p for p in patterns if _is_glob(p))
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.exact or (self.wildcard is not None and self.wildcard.match(item) is not None)
+
+
+@lru_cache(maxsize=64)
+def _glob_set(patterns: Tuple[str, ...]) -> Optional[_GlobSet]:
+    return _GlobSet(patterns) if patterns else None
+
+
+def _glob_predicate(pattern: str) -> Callable[[str], object]:
+    """Exact patterns become an equality check; wildcard patterns are compiled once."""
+    if not _is_glob(pattern):
+        return lambda s: s == pattern
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+class GlobFilter:
+    """
+    Whitelist/blacklist filter for IDs such as clients, connections and channels.
+    A non-empty whitelist takes precedence; otherwise anything not matching the
+    blacklist is kept. Literal IDs are checked with a set lookup and wildcard
+    patterns are compiled once into a single regex per list.
+    """
+    def __init__(self, whitelist: Iterable[str], blacklist: Iterable[str]):
+        self._whitelist = _glob_set(tuple(whitelist))
+        self._blacklist = _glob_set(tuple(blacklist))
+
+    def __call__(self, item: str) -> bool:
+        if self._whitelist is not None:
+            return item in self._whitelist
+        return self._blacklist is None or item not in self._blacklist
+
+    def filter(self, items: Iterable[str]) -> List[str]:
+        return [i for i in items if self(i)]
+
+
 class PacketFilter:
     """
     Wildcard-based allow/deny packet filter for clients and channels.
@@ -10,13 +78,21 @@ class PacketFilter:
     def __init__(self, policy: str, rules: list[list[str]]):
         self.allow = policy.lower() == 'allow'
         self.rules = rules
+        # rules sharing a client pattern are matched with one regex over their channel patterns
+        channels_by_client: Dict[str, List[str]] = {}
+        for c_pat, ch_pat in rules:
+            channels_by_client.setdefault(c_pat, []).append(ch_pat)
+        self._predicates = [
+            (_glob_predicate(c_pat), compile_globs(ch_pats).match)
+            for c_pat, ch_pats in channels_by_client.items()
+        ]
 
     def matches(self, client: str, channel: str) -> bool:
         # If any rule matches, return allow; else return opposite
-        for c_pat, ch_pat in self.rules:
-            if fnmatch.fnmatch(client, c_pat) and fnmatch.fnmatch(channel, ch_pat):
+        for client_match, channel_match in self._predicates:
+            if client_match(client) and channel_match(channel):
                 return self.allow
         return not self.allow
 
 # Expose ExcludedSequences for convenience
-ExcludedSequences = ExcludedSequences
\ No newline at end of file
+ExcludedSequences = ExcludedSequences
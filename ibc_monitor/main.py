@@ -1,5 +1,7 @@
 import argparse
 import logging
+import signal
+import sys
 from pathlib import Path
 from ibc_monitor.config import Config
 from ibc_monitor.exporter import IBCExporter
@@ -19,6 +21,8 @@ def main():
     level = getattr(logging, cfg.log_level.upper(), logging.INFO)
     logging.basicConfig(level=level)
     exporter = IBCExporter(cfg)
+    # turn SIGTERM into SystemExit so the exporter can persist its state on the way out
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     exporter.run()
 
 
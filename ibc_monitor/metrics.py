@@ -15,7 +15,7 @@ CLIENT_TRUSTING_PERIOD = Gauge(
 )
 CLIENT_LAST_UPDATE = Gauge(
     'ibc_client_last_update_timestamp_seconds',
-    'Last consensus state update time',
+    'Last consensus state update time (NaN when unknown)',
     ['client_id', 'chain_id', 'counterparty_chain_id', 'counterparty_client_id'],
 )
 CLIENT_STATUS = Gauge(
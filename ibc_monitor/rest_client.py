@@ -1,12 +1,37 @@
 from __future__ import annotations
 
 import logging
-from typing import List, Optional, Set
+import threading
+import time
+from typing import Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_MAXSIZE = 32
+# upper bound on TCP connect time; the read timeout is the per-call timeout
+CONNECT_TIMEOUT = 2
+# read timeout for queries and health probes that do not pass their own
+DEFAULT_QUERY_TIMEOUT = 3
+# a successful query within this many seconds stands in for a node_info probe
+DEFAULT_HEALTH_TTL = 60
+# chain-registry endpoint lists are near-static: refetch at most this often, and only
+# once every known endpoint has failed
+REGISTRY_TTL = 3600
+# longest Retry-After we honour in place; longer waits fail over to the next endpoint
+MAX_RETRY_AFTER = 5
+# a failed endpoint is skipped for this long, doubling per consecutive failure up to the max
+UNHEALTHY_BACKOFF = 5
+MAX_UNHEALTHY_BACKOFF = 300
+
 
 class RESTClientError(Exception):
     """Base error for REST client failures."""
@@ -26,6 +51,29 @@ class RESTQueryError(RESTClientError):
         super().__init__(msg)
 
 
+class _BoundedRetry(Retry):
+    """Retry that honours a provider's Retry-After on 429/503, but never sleeps past MAX_RETRY_AFTER."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER)
+
+
+def _decode(resp) -> dict:
+    """Decode a JSON response body, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
+def _is_endpoint_failure(error: requests.HTTPError) -> bool:
+    """Only 5xx (or a missing status) says something about the endpoint; 4xx is about the request."""
+    status = getattr(error.response, "status_code", None)
+    return status is None or status >= 500
+
+
 class RESTClient:
     """Simple REST client with fallback endpoint support.
 
@@ -42,6 +90,8 @@ class RESTClient:
         chain_name: str,
         fallback_endpoints: Optional[List[str]] = None,
         enable_chain_registry_fallbacks: bool = False,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        health_ttl: float = DEFAULT_HEALTH_TTL,
     ):
         self.primary = (primary_endpoint or "").strip().rstrip("/")
         self.expected_chain_id = expected_chain_id
@@ -56,7 +106,39 @@ class RESTClient:
         self.endpoint = self.primary or (self.fallbacks[0] if self.fallbacks else "")
         self.enable_chain_registry_fallbacks = enable_chain_registry_fallbacks
         self._loaded_fallbacks = not enable_chain_registry_fallbacks
-        self.unhealthy: Set[str] = set()
+        # monotonic time of the last chain-registry fetch
+        self._fallbacks_loaded_at = 0.0
+        # endpoint -> monotonic time before which it is not probed again
+        self.unhealthy: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self.health_ttl = health_ttl
+        # monotonic time of the last successful request against self.endpoint
+        self._last_ok = 0.0
+        # serializes endpoint failover when queries run on several threads
+        self._failover_lock = threading.RLock()
+        # one keep-alive session for all endpoints; size the pool for the exporter's worker threads
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=pool_maxsize,
+            # retry transient gateway errors and rate limiting in place before marking the endpoint
+            # unhealthy; connect/read failures fail over at once instead of paying the timeout again
+            max_retries=_BoundedRetry(
+                total=2,
+                connect=0,
+                read=0,
+                other=0,
+                status=2,
+                backoff_factor=0.2,
+                status_forcelist=(429, 502, 503, 504),
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """Release the pooled keep-alive connections held by this client."""
+        self._session.close()
 
     def _load_fallbacks(self) -> None:
         """Load REST fallbacks from the Cosmos chain-registry."""
@@ -68,9 +150,9 @@ class RESTClient:
                 "https://raw.githubusercontent.com/cosmos/chain-registry/master/"
                 f"{self.chain_name}/chain.json"
             )
-            resp = requests.get(url, timeout=3)
+            resp = self._session.get(url, timeout=(CONNECT_TIMEOUT, 3))
             resp.raise_for_status()
-            data = resp.json()
+            data = _decode(resp)
             for api in data.get("apis", {}).get("rest", []):
                 addr = api.get("address", "").strip().rstrip("/")
                 if addr and addr != self.primary and addr not in self.fallbacks:
@@ -84,24 +166,56 @@ class RESTClient:
             logger.warning("Failed to load fallback REST endpoints for %s: %s", self.chain_name, e)
         finally:
             self._loaded_fallbacks = True
+            self._fallbacks_loaded_at = time.monotonic()
 
-    def health(self) -> bool:
+    def health(self, timeout: float = DEFAULT_QUERY_TIMEOUT) -> bool:
         """Check the health of the current endpoint and switch if necessary."""
+        with self._failover_lock:
+            if (
+                self._last_ok
+                and time.monotonic() - self._last_ok < self.health_ttl
+                and self.endpoint not in self.unhealthy
+            ):
+                return True
+            return self._check_health(timeout)
+
+    def _mark_unhealthy(self, endpoint: str) -> None:
+        with self._failover_lock:
+            failures = self._failures.get(endpoint, 0) + 1
+            self._failures[endpoint] = failures
+            backoff = min(MAX_UNHEALTHY_BACKOFF, UNHEALTHY_BACKOFF * 2 ** (failures - 1))
+            self.unhealthy[endpoint] = time.monotonic() + backoff
+
+    def _backing_off(self, endpoint: str, now: float | None = None) -> bool:
+        retry_at = self.unhealthy.get(endpoint)
+        return retry_at is not None and (time.monotonic() if now is None else now) < retry_at
+
+    def _check_health(self, timeout: float = DEFAULT_QUERY_TIMEOUT) -> bool:
         if not self._loaded_fallbacks:
             self._load_fallbacks()
         endpoints = self.endpoints()
         if not endpoints:
             return False
-        if len(self.unhealthy) >= len(endpoints):
+        now = time.monotonic()
+        if all(self._backing_off(ep, now) for ep in endpoints):
+            if (
+                not self.enable_chain_registry_fallbacks
+                or now - self._fallbacks_loaded_at < REGISTRY_TTL
+            ):
+                # every endpoint failed recently: fail fast instead of waiting on timeouts again
+                return False
+            # everything we know is down: the registry may list newer endpoints
+            self._load_fallbacks()
+            endpoints = self.endpoints()
             self.unhealthy.clear()
         for ep in endpoints:
-            if ep in self.unhealthy:
+            if self._backing_off(ep, now):
                 continue
             try:
                 url = f"{ep}/cosmos/base/tendermint/v1beta1/node_info"
-                resp = requests.get(url, timeout=3)
+                resp = self._session.get(url, timeout=(min(CONNECT_TIMEOUT, timeout), timeout))
                 resp.raise_for_status()
-                chain_id = resp.json().get("default_node_info", {}).get("network", "")
+                chain_id = _decode(resp).get("default_node_info", {}).get("network", "")
                 if chain_id != self.expected_chain_id:
                     logger.error(
                         "Chain ID mismatch on %s: got %s, expected %s",
@@ -109,15 +223,18 @@ class RESTClient:
                         chain_id,
                         self.expected_chain_id,
                     )
-                    self.unhealthy.add(ep)
+                    self._mark_unhealthy(ep)
                     continue
+                self.unhealthy.pop(ep, None)
+                self._failures.pop(ep, None)
                 if ep != self.endpoint:
                     logger.info("Switching endpoint from %s to %s", self.endpoint, ep)
                     self.endpoint = ep
+                self._last_ok = time.monotonic()
                 return True
             except Exception as e:  # pragma: no cover - network failures
                 logger.warning("REST health check failed for %s: %s", ep, e)
-                self.unhealthy.add(ep)
+                self._mark_unhealthy(ep)
                 continue
         return False
 
@@ -133,7 +250,7 @@ class RESTClient:
             self.endpoint = endpoints[0]
         return endpoints
 
-    def query(self, path: str, params: Optional[dict] = None, timeout: int = 3) -> dict:
+    def query(self, path: str, params: Optional[dict] = None, timeout: float = DEFAULT_QUERY_TIMEOUT) -> dict:
         """Perform a GET request on the current REST endpoint."""
         if not path.startswith("/"):
             raise ValueError(f"REST query path must start with '/': {path}")
@@ -143,19 +260,30 @@ class RESTClient:
         endpoints = self.endpoints()
         if not endpoints:
             raise RESTQueryError(path, self.endpoint, ValueError("no REST endpoints available"))
+        if self._backing_off(self.endpoint) and not self.health(timeout):
+            raise RESTQueryError(path, self.endpoint, ValueError("all REST endpoints are backing off"))
         while attempts < len(endpoints):
             url = f"{self.endpoint}{path}"
             logger.debug("GET %s params=%s", url, params)
             try:
-                r = requests.get(url, params=params or {}, timeout=timeout)
+                r = self._session.get(url, params=params or {}, timeout=(min(CONNECT_TIMEOUT, timeout), timeout))
                 logger.debug("Response %s -> %s", url, r.status_code)
                 r.raise_for_status()
-                return r.json()
+                data = _decode(r)
+                self._last_ok = time.monotonic()
+                if self._failures:
+                    self._failures.pop(self.endpoint, None)
+                    self.unhealthy.pop(self.endpoint, None)
+                return data
             except Exception as e:  # pragma: no cover - network failures
+                if isinstance(e, requests.HTTPError) and not _is_endpoint_failure(e):
+                    # a 4xx answers this request (e.g. 404 for a missing connection); the endpoint is fine
+                    raise RESTQueryError(path, self.endpoint, e) from e
                 last_error = e
                 logger.warning("REST query failed for %s: %s", url, e)
-                self.unhealthy.add(self.endpoint)
-                if not self.health():
+                self._last_ok = 0.0
+                self._mark_unhealthy(self.endpoint)
+                if not self.health(timeout):
                     break
                 endpoints = self.endpoints()
             attempts += 1
@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import time
 import logging
-from typing import List, Tuple, Dict, Set, Optional
-import fnmatch
+import threading
+from concurrent.futures import Executor
+from typing import FrozenSet, Iterable, List, Tuple, Dict, Set, Optional
 from requests.exceptions import HTTPError
 from urllib.parse import quote_plus
+from ibc_monitor.filters import GlobFilter
 from ibc_monitor.rest_client import RESTClient, RESTQueryError
 
 logger = logging.getLogger(__name__)
+# counterparty chains without a config entry keep every channel
+_ALLOW_ALL = GlobFilter([], [])
 
 
 class PaginationError(RuntimeError):
@@ -54,22 +58,40 @@ class StateScanner:
         self,
         client: RESTClient,                     # home chain REST client
         cfg,
-        counterparty_chain_ids: List[str],
+        counterparty_chain_ids: Iterable[str],
         rest_by_chain: Optional[Dict[str, RESTClient]] = None,  # cp chain_id -> RESTClient
         home_chain_id: Optional[str] = None,
         cp_chain_cfgs: Optional[Dict[str, object]] = None,
+        executor: Optional[Executor] = None,    # fans out independent per-entity queries
     ):
         self.rest = client
+        self.executor = executor
         self.cfg = cfg
-        self.counterparty_chain_ids = set(counterparty_chain_ids)
+        self.counterparty_chain_ids: FrozenSet[str] = frozenset(counterparty_chain_ids)
         self.rest_by_chain = rest_by_chain or {}
         self.cp_chain_cfgs = cp_chain_cfgs or {}
         self.home_chain_id = home_chain_id or getattr(self.rest, "expected_chain_id", "")
+        # config is fixed for the scanner's lifetime: build the filters once, not per scan
+        self._client_filter = GlobFilter(cfg.whitelist_clients, cfg.blacklist_clients)
+        self._connection_filter = GlobFilter(cfg.whitelist_connections, cfg.blacklist_connections)
+        self._channel_filter = GlobFilter(cfg.whitelist_channels, cfg.blacklist_channels)
+        self._cp_channel_filters: Dict[str, GlobFilter] = {
+            chain_id: GlobFilter(cp_cfg.whitelist_channels, cp_cfg.blacklist_channels)
+            for chain_id, cp_cfg in self.cp_chain_cfgs.items()
+        }
 
         self.last_scan = 0
+        # background scanning (see start_background); results are handed over via _ready
+        self._background: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._first_ready = threading.Event()
+        self._ready_lock = threading.Lock()
+        self._ready: Optional[Tuple[Optional[dict], float]] = None
 
         # home-side state (kept for backward compatibility with exporter)
         self.clients: List[str] = []
+        # total number of clients on the home chain as of the last scan
+        self.home_client_count = 0
         self.connections: List[str] = []
         self.client_chain_map: Dict[str, str] = {}
         self.client_status_map: Dict[str, str] = {}
@@ -109,50 +131,23 @@ class StateScanner:
             return path
         return f"{path}{'&' if '?' in path else '?'}{'&'.join(params)}"
 
-    def _query_all(self, path: str, list_key: str, timeout: int, ignore_404: bool = False):
+    def _paginate(self, rc: RESTClient, path: str, list_key: str, timeout: int, ignore_404: bool = False):
         """
-        Follow pagination.next_key for list endpoints on the *home* REST client.
+        Follow pagination.next_key for list endpoints on the given REST client
+        (self.rest for the home chain, a counterparty client otherwise).
         Expects: { "<list_key>": [...], "pagination": {"next_key": "<base64>|null"} }
         """
         items: List = []
         next_key = None
         seen_next_keys: Set[str] = set()
         pages = 0
+        max_pages = self._max_pages()
+        limit = self._pagination_limit()
         while True:
             pages += 1
-            if pages > self._max_pages():
+            if pages > max_pages:
                 raise PaginationError(f"Exceeded max pages for {path}")
-            qpath = self._page_path(path, next_key, self._pagination_limit())
-            try:
-                res = self.rest.query(qpath, timeout=timeout)
-            except HTTPError as e:
-                if ignore_404 and e.response is not None and e.response.status_code == 404:
-                    return []
-                raise
-            except RESTQueryError as e:
-                if ignore_404 and e.status_code == 404:
-                    return []
-                raise
-            items.extend(res.get(list_key, []) or [])
-            next_key = (res.get("pagination") or {}).get("next_key")
-            if not next_key:
-                break
-            if next_key in seen_next_keys:
-                raise PaginationError(f"Repeated pagination.next_key for {path}")
-            seen_next_keys.add(next_key)
-        return items
-
-    def _query_all_on(self, rc: RESTClient, path: str, list_key: str, timeout: int, ignore_404: bool = False):
-        """Follow pagination.next_key for list endpoints on a *given* REST client (counterparty)."""
-        items: List = []
-        next_key = None
-        seen_next_keys: Set[str] = set()
-        pages = 0
-        while True:
-            pages += 1
-            if pages > self._max_pages():
-                raise PaginationError(f"Exceeded max pages for {path}")
-            qpath = self._page_path(path, next_key, self._pagination_limit())
+            qpath = self._page_path(path, next_key, limit)
             try:
                 res = rc.query(qpath, timeout=timeout)
             except HTTPError as e:
@@ -163,7 +158,9 @@ class StateScanner:
                 if ignore_404 and e.status_code == 404:
                     return []
                 raise
-            items.extend(res.get(list_key, []) or [])
+            page = res.get(list_key)
+            if page:
+                items.extend(page)
             next_key = (res.get("pagination") or {}).get("next_key")
             if not next_key:
                 break
@@ -172,21 +169,34 @@ class StateScanner:
             seen_next_keys.add(next_key)
         return items
 
-    def _filter_list(self, items: List[str], whitelist: List[str], blacklist: List[str]) -> List[str]:
-        if whitelist:
-            return [i for i in items if any(fnmatch.fnmatch(i, pat) for pat in whitelist)]
-        return [i for i in items if not any(fnmatch.fnmatch(i, pat) for pat in blacklist)]
-
-    def _match_any(self, item: str, whitelist: List[str], blacklist: List[str]) -> bool:
-        if whitelist:
-            return any(fnmatch.fnmatch(item, pat) for pat in whitelist)
-        return not any(fnmatch.fnmatch(item, pat) for pat in blacklist)
-
-    def _cp_channel_filters(self, cp_chain: str):
-        cp_cfg = self.cp_chain_cfgs.get(cp_chain)
-        if cp_cfg is None:
-            return [], []
-        return cp_cfg.whitelist_channels, cp_cfg.blacklist_channels
+    def _map(self, fn, items) -> list:
+        """Apply fn to every item in order, fanning out over the executor when one is set."""
+        items = list(items)
+        if self._stop.is_set():
+            # stop_background() is waiting on this scan: don't start more work on a closing pool
+            raise RuntimeError("state scan stopped")
+        if self.executor is None or len(items) < 2:
+            return [fn(item) for item in items]
+        return list(self.executor.map(fn, items))
+
+    def _connection(self, conn: str, timeout: int) -> dict:
+        """Fetch a home connection end; a missing connection yields an empty dict."""
+        try:
+            return self.rest.query(
+                f"/ibc/core/connection/v1/connections/{conn}",
+                timeout=timeout,
+            ).get("connection", {}) or {}
+        except HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return {}
+            raise
+        except RESTQueryError as e:
+            if e.status_code == 404:
+                return {}
+            raise
+
+    def _cp_channel_filter(self, cp_chain: str) -> GlobFilter:
+        return self._cp_channel_filters.get(cp_chain, _ALLOW_ALL)
 
     def _omit_inactive_clients(self) -> bool:
         return bool(getattr(self.cfg, "omit_inactive_clients", False))
@@ -213,9 +223,17 @@ class StateScanner:
 
     # ------------- main scan -------------
 
-    def scan(self) -> bool:
-        now = time.time()
-        if now - self.last_scan < self.cfg.state_refresh_interval:
+    def scan(self, timeout: Optional[float] = None) -> bool:
+        """
+        Refresh the topology if it is due. With a background scanner running, timeout
+        bounds how long to wait for its first result; None waits indefinitely.
+        """
+        if self._background is not None:
+            return self._publish_background_result(timeout)
+
+        now = time.monotonic()
+        if self.last_scan and now - self.last_scan < self.cfg.state_refresh_interval:
+            # the previous scan is still fresh: skip the client/connection/channel fan-out
             return True
 
         # Only scan fully when this scanner runs on the designated *home* chain.
@@ -228,12 +246,25 @@ class StateScanner:
             self.last_scan = now
             return True
 
+        state = self._collect()
+        if state is None:
+            return False
+        self._publish(state, now)
+        return True
+
+    def _collect(self) -> Optional[dict]:
+        """Run one full scan and return the new state, or None if it failed."""
         home_chain_id = self.home_chain_id
         logger.debug("Scanning IBC state (home=%s)", home_chain_id)
 
+        client_filter = self._client_filter
+        connection_filter = self._connection_filter
+        channel_filter = self._channel_filter
+
         try:
             # 1) HOME: list all clients, keep only those whose client_state.chain_id is in the counterparty allowlist
-            all_clients = self._query_all(
+            all_clients = self._paginate(
+                self.rest,
                 "/ibc/core/client/v1/client_states",
                 "client_states",
                 timeout=self.cfg.state_scan_timeout,
@@ -252,29 +283,52 @@ class StateScanner:
                 local_clients.append(cid)
                 client_chain_map[cid] = chain_id
 
-            filtered_clients = self._filter_list(
-                local_clients,
-                self.cfg.whitelist_clients,
-                self.cfg.blacklist_clients,
-            )
+            filtered_clients = client_filter.filter(local_clients)
+            timeout = self.cfg.state_scan_timeout
+            omit_inactive = self._omit_inactive_clients()
+
+            # each stage below starts a client's (or connection's) next query as soon as its
+            # own previous one returns, instead of waiting for the whole stage to finish
+            def client_stage(cid: str):
+                status = self._client_status_on(self.rest, cid, timeout, required=omit_inactive)
+                if omit_inactive and status not in ACTIVE_CLIENT_STATUSES:
+                    return status, None
+                conn_ids = self._paginate(
+                    self.rest,
+                    f"/ibc/core/connection/v1/client_connections/{cid}",
+                    "connection_paths",
+                    timeout=timeout,
+                    ignore_404=True,
+                )
+                return status, conn_ids
+
+            def connection_stage(conn: str):
+                # the channel listing does not depend on the connection end, so fetch both here
+                conn_res = self._connection(conn, timeout)
+                if not connection_filter(conn):
+                    return conn_res, None
+                chs = self._paginate(
+                    self.rest,
+                    f"/ibc/core/channel/v1/connections/{conn}/channels",
+                    "channels",
+                    timeout=timeout,
+                    ignore_404=True,
+                )
+                return conn_res, chs
+
             client_status_map: Dict[str, str] = {}
-            if filtered_clients:
-                active_clients: List[str] = []
-                for cid in filtered_clients:
-                    status = self._client_status_on(
-                        self.rest,
-                        cid,
-                        self.cfg.state_scan_timeout,
-                        required=self._omit_inactive_clients(),
-                    )
-                    client_status_map[cid] = status
-                    if self._omit_inactive_clients() and status not in ACTIVE_CLIENT_STATUSES:
-                        logger.debug("Skipping inactive client %s with status %s", cid, status)
-                        continue
-                    active_clients.append(cid)
-                filtered_clients = active_clients
+            conn_ids_by_client: Dict[str, List[str]] = {}
+            active_clients: List[str] = []
+            for cid, (status, conn_ids) in zip(filtered_clients, self._map(client_stage, filtered_clients)):
+                client_status_map[cid] = status
+                if omit_inactive and status not in ACTIVE_CLIENT_STATUSES:
+                    logger.debug("Skipping inactive client %s with status %s", cid, status)
+                    continue
+                active_clients.append(cid)
+                conn_ids_by_client[cid] = conn_ids
+            filtered_clients = active_clients
             filtered_client_chain_map = {cid: client_chain_map[cid] for cid in filtered_clients}
-            client_status_map = {cid: client_status_map.get(cid, "unknown") for cid in filtered_clients}
+            client_status_map = {cid: client_status_map[cid] for cid in filtered_clients}
             logger.debug("Relevant clients (home): %s", filtered_clients)
 
             # 2) HOME: for each relevant client -> client_connections (paginated) -> connection state
@@ -283,34 +337,21 @@ class StateScanner:
             all_conns: List[str] = []
             cp_conn_per_chain: Dict[str, Dict[str, str]] = {}
 
+            # clients can share a connection id: fetch each connection once and reuse the result
+            unique_conns = list(dict.fromkeys(
+                conn for cid in filtered_clients for conn in conn_ids_by_client[cid] or ()
+            ))
+            conn_stage_results = dict(zip(unique_conns, self._map(connection_stage, unique_conns)))
+            chs_by_conn: Dict[str, List] = {}
             for cid in filtered_clients:
-                conn_ids = self._query_all(
-                    f"/ibc/core/connection/v1/client_connections/{cid}",
-                    "connection_paths",
-                    timeout=self.cfg.state_scan_timeout,
-                    ignore_404=True,
-                )
+                conn_ids = conn_ids_by_client[cid]
                 if not conn_ids:
                     logger.debug("No connections for client %s", cid)
                     continue
 
                 for conn in conn_ids:
                     connection_client_map[conn] = cid
-                    try:
-                        conn_res = self.rest.query(
-                            f"/ibc/core/connection/v1/connections/{conn}",
-                            timeout=self.cfg.state_scan_timeout,
-                        ).get("connection", {}) or {}
-                    except HTTPError as e:
-                        if e.response is not None and e.response.status_code == 404:
-                            conn_res = {}
-                        else:
-                            raise
-                    except RESTQueryError as e:
-                        if e.status_code == 404:
-                            conn_res = {}
-                        else:
-                            raise
+                    conn_res, chs_by_conn[conn] = conn_stage_results[conn]
 
                     cp = conn_res.get("counterparty") or {}
                     cp_client_id = cp.get("client_id", "")
@@ -325,23 +366,15 @@ class StateScanner:
 
                 all_conns.extend(conn_ids)
 
-            filtered_conns = self._filter_list(
-                all_conns,
-                self.cfg.whitelist_connections,
-                self.cfg.blacklist_connections,
-            )
+            filtered_conns = connection_filter.filter(all_conns)
             logger.debug("Relevant connections (home): %s", filtered_conns)
 
-            # 3) HOME: channels per relevant connection (paginated)
-            chan_list: List[Tuple[str, str, str, str, str, str]] = []
+            # 3) HOME: channels per relevant connection (paginated, fetched in connection_stage)
+            filtered_channels: List[Tuple[str, str, str, str, str, str]] = []
             channel_state_map: Dict[Tuple[str, str, str, str], str] = {}
+            omit_closed = self._omit_closed_channels()
             for conn in filtered_conns:
-                chs = self._query_all(
-                    f"/ibc/core/channel/v1/connections/{conn}/channels",
-                    "channels",
-                    timeout=self.cfg.state_scan_timeout,
-                    ignore_404=True,
-                )
+                chs = chs_by_conn.get(conn)
                 if not chs:
                     logger.debug("No channels for connection %s", conn)
                     continue
@@ -352,36 +385,47 @@ class StateScanner:
                     port, channel = ch.get("port_id"), ch.get("channel_id")
                     if not port or not channel:
                         continue
+                    # filter as channels are produced instead of rebuilding the list afterwards
+                    if not channel_filter(f"{port}/{channel}"):
+                        continue
                     state = self._channel_state(ch)
-                    if self._omit_closed_channels() and state in CLOSED_CHANNEL_STATES:
+                    if omit_closed and state in CLOSED_CHANNEL_STATES:
                         logger.debug("Skipping closed channel %s/%s on %s", port, channel, home_chain_id)
                         continue
                     cp = ch.get("counterparty") or {}
                     cp_port = cp.get("port_id", "")
                     cp_channel = cp.get("channel_id", "")
-                    chan_list.append((conn, port, channel, cp_port, cp_channel, cp_chain))
+                    filtered_channels.append((conn, port, channel, cp_port, cp_channel, cp_chain))
                     channel_state_map[(home_chain_id, conn, port, channel)] = state
 
-            filtered_channels = [
-                (conn, p, c, cp_p, cp_c, cp_chain)
-                for (conn, p, c, cp_p, cp_c, cp_chain) in chan_list
-                if self._match_any(f"{p}/{c}", self.cfg.whitelist_channels, self.cfg.blacklist_channels)
-            ]
-            filtered_channel_keys = {
-                (home_chain_id, conn, p, c)
-                for (conn, p, c, _cp_p, _cp_c, _cp_chain) in filtered_channels
-            }
-            channel_state_map = {
-                key: state for key, state in channel_state_map.items()
-                if key in filtered_channel_keys
-            }
-
             # 4) COUNTERPARTIES: scan explicitly using cp connection ids from the *home* connection state
             cp_connections: Dict[str, List[str]] = {}
             cp_client_status_map: Dict[Tuple[str, str], str] = {}
             cp_channels: List[Tuple[str, str, str, str, str, str, str]] = []
             cp_channel_state_map: Dict[Tuple[str, str, str, str], str] = {}
 
+            # every chain has its own endpoint: fan out status and channel queries
+            # across all chains at once so the scan waits for the slowest chain only
+            status_tasks: List[Tuple[RESTClient, str, str]] = []
+            for cp_chain, cp_conn_clients in cp_conn_per_chain.items():
+                rc = self.rest_by_chain.get(cp_chain)
+                if rc:
+                    # several connections can share a client: ask for each status once
+                    status_tasks.extend((rc, cp_chain, c) for c in dict.fromkeys(cp_conn_clients.values()) if c)
+            statuses = self._map(
+                lambda task: self._client_status_on(
+                    task[0],
+                    task[2],
+                    self.cfg.state_scan_timeout,
+                    required=self._omit_inactive_clients(),
+                ),
+                status_tasks,
+            )
+            for (_rc, cp_chain, cp_client_id), status in zip(status_tasks, statuses):
+                cp_client_status_map[(cp_chain, cp_client_id)] = status
+
+            channel_tasks: List[Tuple[RESTClient, str, str]] = []
+            cp_channel_filters: Dict[str, GlobFilter] = {}
             for cp_chain, cp_conn_clients in cp_conn_per_chain.items():
                 rc = self.rest_by_chain.get(cp_chain)
                 if not rc:
@@ -391,13 +435,7 @@ class StateScanner:
                 cp_conn_ids = []
                 for cp_conn, cp_client_id in cp_conn_clients.items():
                     if cp_client_id:
-                        status = self._client_status_on(
-                            rc,
-                            cp_client_id,
-                            self.cfg.state_scan_timeout,
-                            required=self._omit_inactive_clients(),
-                        )
-                        cp_client_status_map[(cp_chain, cp_client_id)] = status
+                        status = cp_client_status_map[(cp_chain, cp_client_id)]
                         if self._omit_inactive_clients() and status not in ACTIVE_CLIENT_STATUSES:
                             logger.debug(
                                 "Skipping counterparty connection %s on %s for inactive client %s (%s)",
@@ -409,70 +447,149 @@ class StateScanner:
                             continue
                     cp_conn_ids.append(cp_conn)
 
-                cp_conn_ids_filtered = self._filter_list(
-                    cp_conn_ids,
-                    self.cfg.whitelist_connections,
-                    self.cfg.blacklist_connections,
-                )
+                cp_conn_ids_filtered = connection_filter.filter(cp_conn_ids)
                 cp_connections[cp_chain] = cp_conn_ids_filtered
+                cp_channel_filters[cp_chain] = self._cp_channel_filter(cp_chain)
+                channel_tasks.extend((rc, cp_chain, cp_conn) for cp_conn in cp_conn_ids_filtered)
 
-                for cp_conn in cp_conn_ids_filtered:
-                    chs = self._query_all_on(
-                        rc,
-                        f"/ibc/core/channel/v1/connections/{cp_conn}/channels",
-                        "channels",
-                        timeout=self.cfg.state_scan_timeout,
-                        ignore_404=True,
-                    )
-                    if not chs:
-                        logger.debug("No channels on %s for counterparty %s", cp_conn, cp_chain)
-                        continue
+            chs_by_task = self._map(
+                lambda task: self._paginate(
+                    task[0],
+                    f"/ibc/core/channel/v1/connections/{task[2]}/channels",
+                    "channels",
+                    timeout=self.cfg.state_scan_timeout,
+                    ignore_404=True,
+                ),
+                channel_tasks,
+            )
+            for (_rc, cp_chain, cp_conn), chs in zip(channel_tasks, chs_by_task):
+                if not chs:
+                    logger.debug("No channels on %s for counterparty %s", cp_conn, cp_chain)
+                    continue
 
-                    for ch in chs:
-                        port, channel = ch.get("port_id"), ch.get("channel_id")
-                        if not port or not channel:
-                            continue
-                        state = self._channel_state(ch)
-                        if self._omit_closed_channels() and state in CLOSED_CHANNEL_STATES:
-                            logger.debug("Skipping closed channel %s/%s on %s", port, channel, cp_chain)
-                            continue
-                        cp = ch.get("counterparty") or {}
-                        cp_port = cp.get("port_id", "")
-                        cp_channel = cp.get("channel_id", "")
-                        cp_whitelist, cp_blacklist = self._cp_channel_filters(cp_chain)
-                        if not self._match_any(f"{port}/{channel}", cp_whitelist, cp_blacklist):
-                            logger.debug(
-                                "Skipping blacklisted counterparty channel %s/%s on %s",
-                                port,
-                                channel,
-                                cp_chain,
-                            )
-                            continue
-                        cp_channels.append((cp_chain, cp_conn, port, channel, cp_port, cp_channel, home_chain_id))
-                        cp_channel_state_map[(cp_chain, cp_conn, port, channel)] = state
+                cp_channel_filter = cp_channel_filters[cp_chain]
+                for ch in chs:
+                    port, channel = ch.get("port_id"), ch.get("channel_id")
+                    if not port or not channel:
+                        continue
+                    state = self._channel_state(ch)
+                    if omit_closed and state in CLOSED_CHANNEL_STATES:
+                        logger.debug("Skipping closed channel %s/%s on %s", port, channel, cp_chain)
+                        continue
+                    cp = ch.get("counterparty") or {}
+                    cp_port = cp.get("port_id", "")
+                    cp_channel = cp.get("channel_id", "")
+                    if not cp_channel_filter(f"{port}/{channel}"):
+                        logger.debug(
+                            "Skipping blacklisted counterparty channel %s/%s on %s",
+                            port,
+                            channel,
+                            cp_chain,
+                        )
+                        continue
+                    cp_channels.append((cp_chain, cp_conn, port, channel, cp_port, cp_channel, home_chain_id))
+                    cp_channel_state_map[(cp_chain, cp_conn, port, channel)] = state
         except Exception:
-            logger.exception("State scan failed for home chain %s; keeping previous state", home_chain_id)
-            return False
-
-        self.clients = filtered_clients
-        self.client_chain_map = filtered_client_chain_map
-        self.client_status_map = client_status_map
-        self.connection_client_map = connection_client_map
-        self.client_counterparty_client_ids = client_cp_client_ids
-        self.connections = filtered_conns
-        self.channels = filtered_channels
-        self.channel_state_map = channel_state_map
-        self.cp_connections = cp_connections
-        self.cp_client_status_map = cp_client_status_map
-        self.cp_channels = cp_channels
-        self.cp_channel_state_map = cp_channel_state_map
-        self.last_scan = now
+            if self._stop.is_set():
+                logger.debug("State scan for home chain %s interrupted by shutdown", home_chain_id)
+            else:
+                logger.exception("State scan failed for home chain %s; keeping previous state", home_chain_id)
+            return None
+
+        return {
+            "clients": filtered_clients,
+            "home_client_count": len(all_clients),
+            "client_chain_map": filtered_client_chain_map,
+            "client_status_map": client_status_map,
+            "connection_client_map": connection_client_map,
+            "client_counterparty_client_ids": client_cp_client_ids,
+            "connections": filtered_conns,
+            "channels": filtered_channels,
+            "channel_state_map": channel_state_map,
+            "cp_connections": cp_connections,
+            "cp_client_status_map": cp_client_status_map,
+            "cp_channels": cp_channels,
+            "cp_channel_state_map": cp_channel_state_map,
+        }
+
+    def _publish(self, state: dict, scanned_at: float) -> None:
+        self.clients = state["clients"]
+        self.home_client_count = state["home_client_count"]
+        self.client_chain_map = state["client_chain_map"]
+        self.client_status_map = state["client_status_map"]
+        self.connection_client_map = state["connection_client_map"]
+        self.client_counterparty_client_ids = state["client_counterparty_client_ids"]
+        self.connections = state["connections"]
+        self.channels = state["channels"]
+        self.channel_state_map = state["channel_state_map"]
+        self.cp_connections = state["cp_connections"]
+        self.cp_client_status_map = state["cp_client_status_map"]
+        self.cp_channels = state["cp_channels"]
+        self.cp_channel_state_map = state["cp_channel_state_map"]
+        self.last_scan = scanned_at
 
         logger.info(
             "StateScanner[%s] -> home: %d clients, %d connections, %d channels | "
             "cp: %d chains, %d connections, %d channels",
-            home_chain_id,
+            self.home_chain_id,
             len(self.clients), len(self.connections), len(self.channels),
             len(self.cp_connections), sum(len(v) for v in self.cp_connections.values()), len(self.cp_channels)
         )
+
+    # ------------- background scanning -------------
+
+    def start_background(self) -> None:
+        """
+        Scan on a daemon thread every state_refresh_interval. scan() then only swaps in
+        the latest finished result, so update cycles never wait on a full scan (except
+        for the very first one).
+        """
+        if self._background is not None:
+            return
+        if getattr(self.rest, "expected_chain_id", "") != self.home_chain_id:
+            return
+        self._stop.clear()
+        self._background = threading.Thread(
+            target=self._background_loop,
+            name=f"ibc-scanner-{self.home_chain_id}",
+            daemon=True,
+        )
+        self._background.start()
+
+    def stop_background(self, timeout: Optional[float] = None) -> None:
+        """Stop the background scanner and wait up to timeout seconds for its current scan."""
+        self._stop.set()
+        thread = self._background
+        if thread is None or thread is threading.current_thread():
+            return
+        thread.join(timeout)
+        if not thread.is_alive():
+            self._background = None
+            self._stop.clear()
+
+    def _background_loop(self) -> None:
+        while True:
+            started = time.monotonic()
+            state = self._collect()
+            with self._ready_lock:
+                self._ready = (state, started)
+            self._first_ready.set()
+            if self._stop.wait(max(1, self.cfg.state_refresh_interval)):
+                return
+
+    def _publish_background_result(self, timeout: Optional[float] = None) -> bool:
+        if not self.last_scan and not self._first_ready.wait(timeout):
+            logger.warning("First background state scan for %s has not finished yet", self.home_chain_id)
+            return False
+        with self._ready_lock:
+            ready, self._ready = self._ready, None
+        if ready is None:
+            # no newer result: fine as long as an earlier scan succeeded
+            return bool(self.last_scan)
+        state, scanned_at = ready
+        if state is None:
+            return False
+        # update cycles run on a single thread, so swapping attributes here is never
+        # observed half-done by the cycle's workers
+        self._publish(state, scanned_at)
         return True
@@ -3,6 +3,7 @@ from pathlib import Path
 import toml
 import pytest
 from ibc_monitor.config import Config, ChainConfig, ExcludedSequences
+from ibc_monitor.exporter import _url_batch_size
 
 def build_config(tmp_path):
     data = {
@@ -97,6 +98,19 @@ def test_requires_single_home_chain(tmp_path):
         Config(p)
 
 
+def test_rejects_second_home_chain(tmp_path):
+    data = {
+        'chains': [
+            {'name': 'a', 'chain_id': 'a-1', 'rests': ['http://a'], 'home_chain': True},
+            {'name': 'b', 'chain_id': 'b-1', 'rests': ['http://b'], 'home_chain': True},
+        ]
+    }
+    p = tmp_path / 'c.toml'
+    p.write_text(toml.dumps(data))
+    with pytest.raises(ValueError, match='a-1 and b-1'):
+        Config(p)
+
+
 def test_empty_counterparty_endpoints_are_ignored(tmp_path):
     data = {
         'chains': [
@@ -109,6 +123,7 @@ def test_empty_counterparty_endpoints_are_ignored(tmp_path):
     cfg = Config(p)
     assert cfg.chains[1].rests == []
     assert cfg.chains[1].rpcs == []
+    assert cfg.counterparty_chains == [cfg.chains[1]]
 
 
 def test_home_chain_requires_valid_rest_endpoint(tmp_path):
@@ -139,3 +154,26 @@ def test_rejects_invalid_endpoint_url(tmp_path):
     p.write_text(toml.dumps(data))
     with pytest.raises(ValueError):
         Config(p)
+
+
+def test_state_file_is_optional(tmp_path):
+    cfg = build_config(tmp_path)
+    assert cfg.state_file is None
+    assert cfg.state_save_interval == 300
+
+
+def test_health_check_interval_defaults_to_a_minute(tmp_path):
+    cfg = build_config(tmp_path)
+    assert cfg.health_check_interval == 60
+
+
+def test_pagination_limit_defaults_to_large_pages(tmp_path):
+    cfg = build_config(tmp_path)
+    assert cfg.pagination_limit == 1000
+
+
+def test_default_ack_batch_size_fits_the_url_cap(tmp_path):
+    cfg = build_config(tmp_path)
+    assert cfg.ack_batch_size == 200
+    key = "packet_commitment_sequences"
+    assert _url_batch_size(key, [99_999_999], cfg.ack_batch_size) == cfg.ack_batch_size
@@ -1,5 +1,12 @@
+import math
+import threading
+import time
+
+import pytest
+from prometheus_client import Counter, Gauge
+
 import ibc_monitor.metrics as metrics
-from ibc_monitor.exporter import IBCExporter
+from ibc_monitor.exporter import IBCExporter, PendingSequences, _params_repeat, _parse_rfc3339_to_epoch, parse_duration
 from ibc_monitor.config import ChainConfig, ExcludedSequences, Config
 import toml
 
@@ -10,35 +17,41 @@ class FakeHomeClient:
     def __init__(self):
         self.endpoint = "http://home"
         self.fail_commitments = False
+        self.paths = []
 
-    def health(self):
+    def health(self, timeout=None):
         return True
 
     def query(self, path, params=None, timeout=None):
+        self.paths.append(path)
         # Local commitments: 1,2,3 (2 is excluded by config in the test)
-        if "packet_commitments" in path and "unreceived_acks" not in path:
+        if "packet_commitments" in path:
             if self.fail_commitments:
                 raise RuntimeError("commitment query failed")
             return {"commitments": [{"sequence": "1"}, {"sequence": "2"}, {"sequence": "3"}]}
 
-        # Accept ANY form of unreceived_acks request and always pretend "3" is unreceived.
-        # This avoids coupling the test to the exact URL shape used by the exporter.
-        if "unreceived_acks" in path:
-            return {"sequences": ["3"]}
-
         # These are only hit if scanner.clients is non-empty; we keep it empty in the test
         if "/client/v1/client_states/" in path:
-            return {"client_state": {"trusting_period": "1s", "chain_id": "chain-2"}}
+            return {
+                "client_state": {
+                    "trusting_period": "1s",
+                    "chain_id": "chain-2",
+                    "latest_height": {"revision_number": "2", "revision_height": "100"},
+                }
+            }
         if "/client/v1/consensus_states/" in path:
             return {"consensus_state": {"timestamp": "2020-01-01T00:00:00Z"}}
         return {}
 
+    def close(self):
+        pass
+
 
 class FakeCounterpartyClient:
     def __init__(self):
         self.endpoint = "http://cp"
 
-    def health(self):
+    def health(self, timeout=None):
         return True
 
     def query(self, path, params=None, timeout=None):
@@ -48,6 +61,9 @@ class FakeCounterpartyClient:
             return {"acknowledgements": [{"sequence": "2"}, {"sequence": "3"}]}
         return {}
 
+    def close(self):
+        pass
+
 
 class FakeScanner:
     def __init__(self):
@@ -63,7 +79,7 @@ class FakeScanner:
         self.cp_client_status_map = {}
         self.cp_channel_state_map = {}
 
-    def scan(self):
+    def scan(self, timeout=None):
         return True
 
 
@@ -101,21 +117,31 @@ def build_home_anchored_exporter():
     # in-memory trackers
     exporter.pending_packets = {}
     exporter.pending_acks = {}
+    exporter._rest_health_gauges = {}
+    exporter._chain_gauge_cache = {}
+    exporter._backlog_gauge_cache = {}
+    exporter._client_gauge_cache = {}
+    exporter._consensus_ts_cache = {}
+    exporter._client_state_cache = {}
+    exporter._closed = False
+    exporter._backlog_labelsets = set()
+    exporter._client_status_labelsets = set()
+    exporter._channel_state_labelsets = set()
 
     return exporter
 
 
 # ---- Tests ----
 
-def test_excluded_sequences_filtered():
-    metrics.BACKLOG_SIZE.clear()
-    metrics.BACKLOG_OLDEST_SEQ.clear()
-    metrics.ACK_BACKLOG_SIZE.clear()
-    metrics.ACK_OLDEST_SEQ.clear()
-    metrics.BACKLOG_UPDATED.clear()
-    metrics.CLIENT_STATUS.clear()
-    metrics.CHANNEL_STATE.clear()
+@pytest.fixture(autouse=True)
+def isolated_metrics():
+    """Start every test from empty metric families so tests can run in any order or worker."""
+    for metric in vars(metrics).values():
+        if isinstance(metric, (Counter, Gauge)):
+            metric.clear()
+
 
+def test_excluded_sequences_filtered():
     exporter = build_home_anchored_exporter()
     exporter.update_metrics()
 
@@ -133,9 +159,10 @@ def test_excluded_sequences_filtered():
     assert metrics.BACKLOG_SIZE.labels(**labels)._value.get() == 2
     assert metrics.BACKLOG_OLDEST_SEQ.labels(**labels)._value.get() == 1
 
-    # Fast-ack path: CP acks {2,3}; home unreceived_acks(...) => {3}; oldest = 3
+    # Fast-ack path: CP acks {2,3} & pending {1,3} => {3}; oldest = 3
     assert metrics.ACK_BACKLOG_SIZE.labels(**labels)._value.get() == 1
     assert metrics.ACK_OLDEST_SEQ.labels(**labels)._value.get() == 3
+    assert not any("unreceived_acks" in path for path in exporter.home_client.paths)
     assert metrics.CHANNEL_STATE.labels(**labels, state="open")._value.get() == 1
     assert metrics.CLIENT_STATUS.labels(
         chain_id="chain-1",
@@ -147,12 +174,6 @@ def test_excluded_sequences_filtered():
 
 
 def test_failed_commitment_query_does_not_clear_existing_backlog():
-    metrics.BACKLOG_SIZE.clear()
-    metrics.BACKLOG_OLDEST_SEQ.clear()
-    metrics.ACK_BACKLOG_SIZE.clear()
-    metrics.ACK_OLDEST_SEQ.clear()
-    metrics.BACKLOG_UPDATED.clear()
-
     exporter = build_home_anchored_exporter()
     exporter.update_metrics()
     exporter.home_client.fail_commitments = True
@@ -207,3 +228,438 @@ def test_chain_registry_fallback_builds_counterparty_clients_without_rest(tmp_pa
     exp = IBCExporter(cfg)
     assert set(exp.rest_by_chain.keys()) == {"a-1"}
     assert exp.rest_by_chain["a-1"].endpoint == ""
+
+
+def test_removed_channel_drops_cached_backlog_gauges():
+    exporter = build_home_anchored_exporter()
+    exporter.update_metrics()
+    label_values = ("chain-1", "connection-1", "port1", "ch1", "chain-2", "port2", "ch2")
+    assert label_values in exporter._backlog_gauge_cache
+    gauges = exporter._backlog_gauge_cache[label_values]
+
+    # a steady-state cycle keeps the same bound children instead of re-creating them
+    exporter.update_metrics()
+    assert exporter._backlog_gauge_cache[label_values] is gauges
+    assert metrics.BACKLOG_SIZE.labels(*label_values) is gauges[0]
+
+    exporter.scanner.channels = []
+    exporter.update_metrics()
+
+    assert label_values not in exporter._backlog_gauge_cache
+    assert not any(
+        sample.labels.get("channel_id") == "ch1"
+        for metric in metrics.BACKLOG_SIZE.collect()
+        for sample in metric.samples
+    )
+
+
+def test_pending_sequences_tracks_oldest():
+    pending = PendingSequences()
+    pending.reconcile([5, 3, 4], now=10)
+    assert (pending.oldest, pending.oldest_ts) == (3, 10)
+
+    pending.reconcile({4, 5, 6}, now=20)
+    assert (pending.oldest, pending.oldest_ts) == (4, 10)
+    assert pending[6] == 20
+    assert 3 not in pending and list(pending) == [4, 5, 6]
+
+    pending.reconcile({2, 4, 5, 6}, now=30)
+    assert (pending.oldest, pending.oldest_ts) == (2, 30)
+
+    # a gap below the top falls back to the general merge
+    pending.reconcile({2, 4, 6, 7}, now=35)
+    assert list(pending.times) == [30, 10, 20, 35]
+
+    pending.reconcile(set(), now=40)
+    assert (pending.oldest, pending.oldest_ts, len(pending)) == (0, 0, 0)
+
+
+def test_client_state_fetched_once_per_client():
+    exporter = build_home_anchored_exporter()
+    exporter.update_metrics()
+
+    paths = exporter.home_client.paths
+    assert paths.count("/ibc/core/client/v1/client_states/client-1") == 1
+    assert "/ibc/core/client/v1/consensus_states/client-1/revision/2/height/100" in paths
+    assert metrics.CLIENT_LAST_UPDATE.labels(
+        client_id="client-1",
+        chain_id="chain-1",
+        counterparty_chain_id="chain-2",
+        counterparty_client_id="",
+    )._value.get() == 1577836800
+
+
+def test_client_state_reused_within_ttl():
+    exporter = build_home_anchored_exporter()
+    exporter.cfg.client_state_ttl = 300
+    exporter.update_metrics()
+    exporter.update_metrics()
+
+    assert exporter.home_client.paths.count("/ibc/core/client/v1/client_states/client-1") == 1
+
+
+def test_parse_rfc3339_to_epoch_offsets():
+    assert _parse_rfc3339_to_epoch("2025-08-11T11:02:48.284737546Z") == 1754910168
+    assert _parse_rfc3339_to_epoch("2025-08-11T11:02:48z") == 1754910168
+    assert _parse_rfc3339_to_epoch("2025-08-11T13:02:48.284737546+02:00") == 1754910168
+    assert _parse_rfc3339_to_epoch("2025-08-11T05:32:48-05:30") == 1754910168
+    assert _parse_rfc3339_to_epoch("not-a-timestamp") is None
+    assert _parse_rfc3339_to_epoch("2024-02-29T00:00:00Z") == 1709164800
+    assert _parse_rfc3339_to_epoch("2020-02-30T00:00:00Z") is None
+    assert _parse_rfc3339_to_epoch("2020-13-01T00:00:00Z") is None
+    assert _parse_rfc3339_to_epoch("2020-01-01T24:00:00Z") is None
+    assert _parse_rfc3339_to_epoch("2020-01-01T00:60:00Z") is None
+    assert _parse_rfc3339_to_epoch("2020-01-01T00:00:60Z") is None
+    assert _parse_rfc3339_to_epoch("2020-01-01T00:00:00.5+24:00") is None
+
+
+def test_consensus_timestamp_reused_until_client_height_changes():
+    exporter = build_home_anchored_exporter()
+    consensus_path = "/ibc/core/client/v1/consensus_states/client-1/revision/2/height/100"
+
+    exporter.update_metrics()
+    exporter.update_metrics()
+
+    assert exporter.home_client.paths.count("/ibc/core/client/v1/client_states/client-1") == 2
+    assert exporter.home_client.paths.count(consensus_path) == 1
+
+
+def test_rest_health_zeroes_previous_endpoint_after_failover():
+    exporter = build_home_anchored_exporter()
+    exporter._set_rest_health("chain-2", "http://a", True)
+    exporter._set_rest_health("chain-2", "http://b", True)
+
+    assert metrics.REST_HEALTH.labels(chain_id="chain-2", endpoint="http://a")._value.get() == 0
+    assert metrics.REST_HEALTH.labels(chain_id="chain-2", endpoint="http://b")._value.get() == 1
+
+
+def test_pending_state_survives_restart(tmp_path):
+    exporter = build_home_anchored_exporter()
+    exporter.cfg.state_file = tmp_path / "state.json"
+    key = ("chain-1", "connection-1", "port1", "ch1")
+    exporter.pending_packets[key] = PendingSequences.from_arrays([3, 1], [20, 10])
+    exporter.pending_acks[key] = PendingSequences()
+    exporter.save_state()
+
+    restored = build_home_anchored_exporter()
+    restored.cfg.state_file = exporter.cfg.state_file
+    restored._load_state()
+
+    pending = restored.pending_packets[key]
+    assert list(pending) == [1, 3]
+    assert (pending.oldest, pending.oldest_ts) == (1, 10)
+    assert key not in restored.pending_acks
+
+
+def test_save_state_logs_unserializable_pending(tmp_path, caplog):
+    exporter = build_home_anchored_exporter()
+    exporter.cfg.state_file = tmp_path / "state.json"
+    exporter.pending_packets[("chain-1", "connection-1", "port1", "ch1")] = object()
+    exporter.save_state()
+
+    assert "Failed to write state file" in caplog.text
+    assert not exporter.cfg.state_file.exists()
+
+
+def test_unknown_consensus_timestamp_is_nan():
+    exporter = build_home_anchored_exporter()
+    query = exporter.home_client.query
+    exporter.home_client.query = lambda path, params=None, timeout=None: (
+        {} if "consensus_states" in path else query(path, params, timeout)
+    )
+    exporter.update_metrics()
+
+    value = metrics.CLIENT_LAST_UPDATE.labels(
+        client_id="client-1",
+        chain_id="chain-1",
+        counterparty_chain_id="chain-2",
+        counterparty_client_id="",
+    )._value.get()
+    assert math.isnan(value)
+
+
+def test_home_client_states_listed_once_when_cheaper():
+    exporter = build_home_anchored_exporter()
+    exporter.cfg.pagination_limit = 100
+    exporter.scanner.clients = ["client-1", "client-2", "client-3"]
+    exporter.scanner.home_client_count = 40
+    query = exporter.home_client.query
+
+    def list_query(path, params=None, timeout=None):
+        if path.startswith("/ibc/core/client/v1/client_states?"):
+            exporter.home_client.paths.append(path)
+            state = {
+                "trusting_period": "1s",
+                "chain_id": "chain-2",
+                "latest_height": {"revision_number": "2", "revision_height": "100"},
+            }
+            return {"client_states": [{"client_id": cid, "client_state": state} for cid in exporter.scanner.clients]}
+        return query(path, params, timeout)
+
+    exporter.home_client.query = list_query
+    exporter.update_metrics()
+
+    paths = exporter.home_client.paths
+    assert sum(p.startswith("/ibc/core/client/v1/client_states?") for p in paths) == 1
+    assert not any(p.startswith("/ibc/core/client/v1/client_states/") for p in paths)
+
+
+def test_home_client_states_listing_honours_client_state_ttl():
+    exporter = build_home_anchored_exporter()
+    exporter.cfg.pagination_limit = 100
+    exporter.cfg.client_state_ttl = 600
+    exporter.scanner.clients = ["client-1", "client-2", "client-3"]
+    exporter.scanner.home_client_count = 40
+    query = exporter.home_client.query
+
+    def list_query(path, params=None, timeout=None):
+        if path.startswith("/ibc/core/client/v1/client_states?"):
+            exporter.home_client.paths.append(path)
+            state = {"trusting_period": "1s", "chain_id": "chain-2"}
+            return {"client_states": [{"client_id": cid, "client_state": state} for cid in exporter.scanner.clients]}
+        return query(path, params, timeout)
+
+    exporter.home_client.query = list_query
+    exporter.update_metrics()
+    exporter.update_metrics()
+
+    paths = exporter.home_client.paths
+    assert sum(p.startswith("/ibc/core/client/v1/client_states?") for p in paths) == 1
+    assert not any(p.startswith("/ibc/core/client/v1/client_states/") for p in paths)
+
+
+def test_query_all_list_fetches_remaining_pages_by_offset():
+    exporter = build_home_anchored_exporter()
+    exporter.cfg.pagination_limit = 2
+    seen = []
+
+    class PagedClient:
+        def query(self, path, params=None, timeout=None):
+            seen.append(path)
+            if "pagination.offset=2" in path:
+                # the second page asks for the total
+                return {"items": [{"sequence": "3"}, {"sequence": "4"}], "pagination": {"next_key": "k3", "total": "10"}}
+            if "pagination.offset=4" in path:
+                # an entry before this offset was deleted meanwhile: "4" shifts onto this page
+                return {"items": [{"sequence": "4"}, {"sequence": "6"}], "pagination": {"next_key": "k5"}}
+            for offset, seqs in ((6, ("7", "8")), (8, ("9", "10"))):
+                if f"pagination.offset={offset}" in path:
+                    return {"items": [{"sequence": s} for s in seqs], "pagination": {}}
+            return {"items": [{"sequence": "1"}, {"sequence": "2"}], "pagination": {"next_key": "k1"}}
+
+    items = exporter._query_all_list(PagedClient(), "/list", "items", item_key="sequence")
+
+    assert [item["sequence"] for item in items] == ["1", "2", "3", "4", "6", "7", "8", "9", "10"]
+    assert seen[0] == "/list?pagination.limit=2"
+    assert seen[1] == "/list?pagination.offset=2&pagination.limit=2&pagination.count_total=true"
+    assert sum("count_total" in path for path in seen) == 1
+    assert not any("pagination.key" in path for path in seen)
+
+
+def test_query_all_list_walks_short_listings_by_key():
+    exporter = build_home_anchored_exporter()
+    seen = []
+
+    class PagedClient:
+        def query(self, path, params=None, timeout=None):
+            seen.append(path)
+            if "pagination.offset=1000" in path:
+                return {"items": [2], "pagination": {"next_key": "k2", "total": "2500"}}
+            if "pagination.key=k2" in path:
+                return {"items": [3], "pagination": {}}
+            return {"items": [1] * 1000, "pagination": {"next_key": "k1"}}
+
+    items = exporter._query_all_list(PagedClient(), "/list", "items", limit=1000)
+    assert items[-2:] == [2, 3]
+    assert len(seen) == 3
+
+    seen.clear()
+
+    class SinglePage:
+        def query(self, path, params=None, timeout=None):
+            seen.append(path)
+            return {"items": [1], "pagination": {}}
+
+    assert exporter._query_all_list(SinglePage(), "/list", "items", limit=1000) == [1]
+    assert seen == ["/list?pagination.limit=1000"]
+
+
+def test_ack_batches_respect_configured_size_and_url_length():
+    exporter = build_home_anchored_exporter()
+    exporter.cfg.ack_batch_size = 2
+    cp = exporter.rest_by_chain["chain-2"]
+    paths = []
+    cp.query = lambda path, params=None, timeout=None: paths.append(path) or {}
+
+    exporter._filtered_ack_sequences(cp, "port2", "ch2", [1, 2, 3, 4, 5])
+    assert len(paths) == 3
+    assert any(p.endswith("?packet_commitment_sequences=1&packet_commitment_sequences=2") for p in paths)
+    assert _params_repeat("k", []) == ""
+
+    paths.clear()
+    exporter.cfg.ack_batch_size = 100000
+    exporter._filtered_ack_sequences(cp, "port2", "ch2", list(range(1, 1001)))
+    assert len(paths) > 1
+    assert all(len(path) < 8192 for path in paths)
+
+
+def test_close_releases_clients_and_pools():
+    exporter = build_home_anchored_exporter()
+    closed = []
+    exporter.home_client.close = lambda: closed.append("home")
+    exporter.rest_by_chain["chain-2"].close = lambda: closed.append("chain-2")
+    with exporter:
+        pool = exporter._executor()
+        assert pool.submit(lambda: 1).result() == 1
+    assert closed == ["home", "chain-2"]
+    assert exporter._io_pool is None
+    assert pool._shutdown
+
+
+def test_parse_duration():
+    assert parse_duration("1209600s") == 1209600
+    assert parse_duration("72h") == 259200
+    assert parse_duration("336h0m0s") == 1209600
+    assert parse_duration("1.5s") == 1
+    assert parse_duration("") == 0
+    assert parse_duration("5m1h") == 0
+    assert parse_duration("72h") == 259200
+    assert parse_duration.cache_info().hits >= 1
+
+
+def test_parse_sequences_skips_malformed_items():
+    assert IBCExporter._parse_sequences([{"sequence": "1"}, {"sequence": "2"}], "ch") == [1, 2]
+    items = [{"sequence": "3"}, {"other": 1}, {"sequence": "x"}, None, {"sequence": "5"}]
+    assert IBCExporter._parse_sequences(items, "ch") == [3, 5]
+
+
+def test_cycle_over_budget_keeps_previous_metrics():
+    exporter = build_home_anchored_exporter()
+    exporter.cfg.cycle_budget = 1
+    exporter.update_metrics()
+    backlog = metrics.BACKLOG_SIZE.labels(
+        chain_id="chain-1",
+        connection_id="connection-1",
+        port_id="port1",
+        channel_id="ch1",
+        counterparty_chain_id="chain-2",
+        counterparty_port_id="port2",
+        counterparty_channel_id="ch2",
+    )
+    assert backlog._value.get() == 2
+
+    exporter._update_home_channel = lambda cycle, ch: time.sleep(1.5)
+    errors = metrics.UPDATE_ERRORS.labels(chain_id="chain-1", stage="budget")
+    errors_before = errors._value.get()
+    exporter.update_metrics()
+
+    assert errors._value.get() == errors_before + 1
+    assert backlog._value.get() == 2
+
+
+def test_work_finishing_after_the_budget_publishes_nothing():
+    exporter = build_home_anchored_exporter()
+    exporter.update_metrics()
+    key = ("chain-1", "connection-1", "port1", "ch1")
+    backlog = metrics.BACKLOG_SIZE.labels(*key, "chain-2", "port2", "ch2")
+    assert backlog._value.get() == 2
+    pending_before = list(exporter.pending_packets[key])
+
+    release = threading.Event()
+    finished = threading.Event()
+    query = exporter.home_client.query
+
+    def slow_query(path, params=None, timeout=None):
+        if "packet_commitments" in path:
+            release.wait(5)
+            return {"commitments": [{"sequence": str(seq)} for seq in (1, 3, 4, 5)]}
+        return query(path, params, timeout)
+
+    update_home_channel = exporter._update_home_channel
+
+    def tracked_update(cycle, ch):
+        try:
+            update_home_channel(cycle, ch)
+        finally:
+            finished.set()
+
+    exporter.home_client.query = slow_query
+    exporter._update_home_channel = tracked_update
+    exporter.cfg.cycle_budget = 1
+    exporter.update_metrics()
+
+    # the abandoned worker completes only after the cycle has given up on it
+    release.set()
+    assert finished.wait(5)
+    assert backlog._value.get() == 2
+    assert list(exporter.pending_packets[key]) == pending_before
+
+
+def test_abandoned_wave_counts_no_errors():
+    exporter = build_home_anchored_exporter()
+    release = threading.Event()
+    finished = threading.Event()
+    timeouts = []
+    query = exporter.home_client.query
+
+    def failing_query(path, params=None, timeout=None):
+        if "packet_commitments" in path:
+            timeouts.append(timeout)
+            release.wait(5)
+            raise RuntimeError("commitment query failed")
+        return query(path, params, timeout)
+
+    update_home_channel = exporter._update_home_channel
+
+    def tracked_update(cycle, ch):
+        try:
+            update_home_channel(cycle, ch)
+        finally:
+            finished.set()
+
+    exporter.home_client.query = failing_query
+    exporter._update_home_channel = tracked_update
+    exporter.cfg.cycle_budget = 1
+    exporter.update_metrics()
+
+    release.set()
+    assert finished.wait(5)
+    # requests made inside a budgeted cycle never wait past its deadline
+    assert timeouts and all(0 < t <= 1 for t in timeouts)
+    assert metrics.UPDATE_ERRORS.labels(chain_id="chain-1", stage="backlog")._value.get() == 0
+    assert metrics.UPDATE_ERRORS.labels(chain_id="chain-1", stage="budget")._value.get() == 1
+
+
+def test_closed_exporter_does_not_recreate_its_pools():
+    exporter = build_home_anchored_exporter()
+    exporter.update_metrics()
+    pool = exporter._executor()
+    exporter.close()
+    exporter.close()
+
+    assert pool._shutdown
+    with pytest.raises(RuntimeError):
+        exporter.update_metrics()
+    assert exporter._io_pool is None
+
+
+def test_independent_rest_work_overlaps_on_the_pool():
+    exporter = build_home_anchored_exporter()
+    exporter.scanner.channels.append(("connection-1", "port1", "ch3", "port2", "ch4", "chain-2"))
+    # each channel's commitment query waits for the other one: only concurrent workers get past it
+    barrier = threading.Barrier(2, timeout=5)
+    query = exporter.home_client.query
+
+    def rendezvous_query(path, params=None, timeout=None):
+        if "packet_commitments" in path:
+            barrier.wait()
+        return query(path, params, timeout)
+
+    exporter.home_client.query = rendezvous_query
+    exporter.update_metrics()
+
+    assert not barrier.broken
+    assert metrics.UPDATE_ERRORS.labels(chain_id="chain-1", stage="backlog")._value.get() == 0
+    labels = ("chain-1", "connection-1", "port1")
+    assert metrics.BACKLOG_SIZE.labels(*labels, "ch1", "chain-2", "port2", "ch2")._value.get() == 2
+    assert metrics.BACKLOG_SIZE.labels(*labels, "ch3", "chain-2", "port2", "ch4")._value.get() == 3
@@ -1,5 +1,5 @@
 import pytest
-from ibc_monitor.filters import PacketFilter, ExcludedSequences
+from ibc_monitor.filters import GlobFilter, PacketFilter, ExcludedSequences
 
 @pytest.fixture
 def pf():
@@ -9,12 +9,50 @@ def test_packet_filter_allow(pf):
     assert pf.matches('abc','cdf')
     assert pf.matches('b','d')
     assert not pf.matches('x','y')
+    assert not pf.matches('bb','d')
 
 def test_packet_filter_deny():
     pf2 = PacketFilter('deny',[['x*','y*']])
     assert not pf2.matches('x1','y1')
     assert pf2.matches('a','b')
 
+def test_packet_filter_groups_rules_by_client():
+    pf3 = PacketFilter('allow', [['07-*', 'channel-1'], ['b', 'd'], ['07-*', 'channel-9*']])
+    assert len(pf3._predicates) == 2
+    assert pf3.matches('07-tendermint-0', 'channel-1')
+    assert pf3.matches('07-tendermint-0', 'channel-95')
+    assert not pf3.matches('07-tendermint-0', 'channel-10')
+    assert not pf3.matches('b', 'channel-1')
+
+def test_packet_filter_literal_client_rejects_non_str():
+    pf4 = PacketFilter('allow', [['b', 'd*']])
+    assert not pf4.matches(None, 'd1')
+    assert not pf4.matches(7, 'd1')
+
+
+def test_glob_filter_whitelist_takes_precedence():
+    gf = GlobFilter(['07-tendermint-*', 'exact'], ['07-tendermint-1'])
+    assert gf('07-tendermint-1')
+    assert gf('exact')
+    assert not gf('exact-2')
+    assert gf.filter(['exact', 'other', '07-tendermint-9']) == ['exact', '07-tendermint-9']
+
+
+def test_glob_filter_blacklist():
+    gf = GlobFilter([], ['transfer/channel-[0-3]'])
+    assert not gf('transfer/channel-2')
+    assert gf('transfer/channel-4')
+    assert GlobFilter([], [])('anything')
+
+
+def test_glob_filter_large_literal_whitelist():
+    gf = GlobFilter([f'07-tendermint-{i}' for i in range(10000)] + ['09-localhost*'], [])
+    assert gf._whitelist.exact and len(gf._whitelist.exact) == 10000
+    assert gf('07-tendermint-9999')
+    assert gf('09-localhost')
+    assert not gf('07-tendermint-10000')
+
+
 def test_excluded_sequences():
     ex = ExcludedSequences({'chain-1': {'ch': [1, '2-3']}})
     assert ex.is_excluded('ch', 1, 'chain-1')
@@ -27,3 +65,51 @@ def test_excluded_sequences_legacy_flat_form():
     ex = ExcludedSequences({'ch': [1, '2-3']})
     assert ex.is_excluded('ch', 1)
     assert ex.is_excluded('ch', 2, 'any-chain')
+
+
+def test_excluded_sequences_get_merges_wildcard_entries():
+    ex = ExcludedSequences({'chain-1': {'ch': [5]}, 'ch': [1, '2-3']})
+    assert [s for s in range(7) if s in ex.get('ch', 'chain-1')] == [1, 2, 3, 5]
+    assert [s for s in range(7) if s in ex.get('ch', 'chain-2')] == [1, 2, 3]
+    assert not ex.get('other', 'chain-1')
+
+
+def test_excluded_sequences_keep_large_ranges_unexpanded():
+    ex = ExcludedSequences({'chain-1': {'ch': ['100-10000000', 7]}})
+    seqs = ex.get('ch', 'chain-1')
+    assert seqs.ranges == ((100, 10000000),)
+    assert seqs.singletons == {7}
+    assert ex.is_excluded('ch', 5000000, 'chain-1')
+    assert not ex.is_excluded('ch', 99, 'chain-1')
+
+
+def test_excluded_sequences_merge_overlapping_ranges():
+    ex = ExcludedSequences({'chain-1': {'ch': [1, '200-500', '400-700', '701-800', '1000-2000']}})
+    seqs = ex.get('ch', 'chain-1')
+    assert seqs.ranges == ((200, 800), (1000, 2000))
+    hits = [s for s in (0, 1, 199, 200, 450, 800, 801, 999, 1000, 2000, 2001) if s in seqs]
+    assert hits == [1, 200, 450, 800, 1000, 2000]
+
+
+def test_excluded_sequences_many_ranges():
+    raw = [f'{i * 1000}-{i * 1000 + 100}' for i in range(1, 10001)]
+    ex = ExcludedSequences({'chain-1': {'ch': raw}})
+    seqs = ex.get('ch', 'chain-1')
+    assert len(seqs.ranges) == 10000
+    assert 5000050 in seqs
+    assert 5000101 not in seqs
+    assert 10000100 in seqs
+    assert 999 not in seqs
+    assert seqs.remove_from(range(990, 1110)) == set(range(990, 1000)) | set(range(1101, 1110))
+
+
+def test_excluded_sequences_remove_from():
+    ex = ExcludedSequences({'chain-1': {'ch': [3, '100-200']}})
+    assert ex.get('ch', 'chain-1').remove_from([1, 3, 99, 100, 150, 200, 201]) == {1, 99, 201}
+    assert ex.get('other', 'chain-1').remove_from([1, 1, 2]) == {1, 2}
+
+
+def test_glob_filters_share_compiled_patterns():
+    first = GlobFilter(['07-tendermint-*'], [])
+    second = GlobFilter(['07-tendermint-*'], [])
+    assert first._whitelist is second._whitelist
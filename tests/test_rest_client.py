@@ -1,6 +1,18 @@
+import json
+import time
+
 import pytest
 import requests
-from ibc_monitor.rest_client import RESTClient, RESTQueryError
+from urllib3.response import HTTPResponse
+from ibc_monitor.rest_client import (
+    MAX_RETRY_AFTER,
+    MAX_UNHEALTHY_BACKOFF,
+    REGISTRY_TTL,
+    UNHEALTHY_BACKOFF,
+    RESTClient,
+    RESTQueryError,
+    _BoundedRetry,
+)
 
 
 class DummyResponse:
@@ -10,12 +22,20 @@ class DummyResponse:
 
     def raise_for_status(self):
         if self.status_code != 200:
-            raise requests.HTTPError()
+            raise requests.HTTPError(response=self)
+
+    @property
+    def content(self):
+        return json.dumps(self._json).encode()
 
     def json(self):
         return self._json
 
 
+def patch_get(monkeypatch, fake_get):
+    monkeypatch.setattr(requests.Session, "get", lambda self, url, **kwargs: fake_get(url, **kwargs))
+
+
 @pytest.fixture
 def patch_health(monkeypatch):
     calls = {"chainjson": 0, "node_info": 0}
@@ -30,7 +50,7 @@ def patch_health(monkeypatch):
         else:
             pytest.skip(f"Unexpected URL: {url}")
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    patch_get(monkeypatch, fake_get)
     return calls
 
 
@@ -50,6 +70,19 @@ def test_health_primary_and_fallback(patch_health):
     assert calls['chainjson'] == 1
     assert calls['node_info'] >= 1
 
+    # steady-state probes reuse the fallback list
+    client.health_ttl = 0
+    assert client.health()
+    assert calls['chainjson'] == 1
+
+    # once every endpoint failed and the list is stale, the registry is consulted again
+    for ep in client.endpoints():
+        client._mark_unhealthy(ep)
+    client._fallbacks_loaded_at -= REGISTRY_TTL
+    assert client.health()
+    assert calls['chainjson'] == 2
+    assert client.endpoints() == ['http://primary', 'http://fb1', 'http://fb2']
+
 
 def test_query_switches_to_healthy_fallback(monkeypatch):
     def fake_get(url, params=None, timeout=3):
@@ -63,7 +96,7 @@ def test_query_switches_to_healthy_fallback(monkeypatch):
             return DummyResponse({'ok': 1})
         pytest.fail(f'Unexpected URL {url}')
 
-    monkeypatch.setattr(requests, 'get', fake_get)
+    patch_get(monkeypatch, fake_get)
     client = RESTClient(
         'http://primary',
         'test-1',
@@ -77,14 +110,17 @@ def test_query_switches_to_healthy_fallback(monkeypatch):
 
 
 def test_query_returns_empty_when_all_fail(monkeypatch):
+    urls = []
+
     def fake_get(url, params=None, timeout=3):
+        urls.append(url)
         if 'chain-registry' in url:
             return DummyResponse({'apis': {'rest': [{'address': 'http://fb1'}]}})
         if url.endswith('/cosmos/base/tendermint/v1beta1/node_info'):
             return DummyResponse({'default_node_info': {'network': 'test-1'}})
         raise requests.RequestException('boom')
 
-    monkeypatch.setattr(requests, 'get', fake_get)
+    patch_get(monkeypatch, fake_get)
     client = RESTClient(
         'http://primary',
         'test-1',
@@ -94,6 +130,62 @@ def test_query_returns_empty_when_all_fail(monkeypatch):
     with pytest.raises(RESTQueryError):
         client.query('/foo')
 
+    # every endpoint is backing off: the next query fails without touching the network
+    urls.clear()
+    with pytest.raises(RESTQueryError):
+        client.query('/foo')
+    assert urls == []
+
+    # once the backoff expires the endpoint is tried again
+    client.unhealthy = dict.fromkeys(client.unhealthy, 0.0)
+    with pytest.raises(RESTQueryError):
+        client.query('/foo')
+    assert 'http://primary/foo' in urls
+    assert client._backing_off('http://primary')
+
+
+def test_not_found_does_not_mark_endpoint_unhealthy(monkeypatch):
+    urls = []
+
+    def fake_get(url, params=None, timeout=3):
+        urls.append(url)
+        if url == 'http://primary/missing':
+            return DummyResponse({'code': 5}, status=404)
+        if url == 'http://primary/foo':
+            return DummyResponse({'ok': 1})
+        pytest.fail(f'Unexpected URL {url}')
+
+    patch_get(monkeypatch, fake_get)
+    client = RESTClient('http://primary', 'test-1', 'testchain')
+    with pytest.raises(RESTQueryError) as excinfo:
+        client.query('/missing')
+    assert excinfo.value.status_code == 404
+    assert client.unhealthy == {}
+    assert client.query('/foo') == {'ok': 1}
+    # no health probe or failover was triggered by the 404
+    assert urls == ['http://primary/missing', 'http://primary/foo']
+
+
+def test_successful_query_resets_failure_count(monkeypatch):
+    patch_get(monkeypatch, lambda url, **kwargs: DummyResponse({'ok': 1}))
+    client = RESTClient('http://primary', 'test-1', 'testchain')
+    client._mark_unhealthy('http://primary')
+    client.unhealthy['http://primary'] = 0.0  # backoff expired
+    assert client.query('/foo') == {'ok': 1}
+    assert client._failures == {}
+    assert client.unhealthy == {}
+
+
+def test_unhealthy_backoff_doubles_up_to_cap():
+    client = RESTClient('http://primary', 'test-1', 'testchain')
+    backoffs = []
+    for _ in range(8):
+        before = time.monotonic()
+        client._mark_unhealthy('http://primary')
+        backoffs.append(round(client.unhealthy['http://primary'] - before))
+    assert backoffs[:3] == [UNHEALTHY_BACKOFF, 2 * UNHEALTHY_BACKOFF, 4 * UNHEALTHY_BACKOFF]
+    assert backoffs[-1] == MAX_UNHEALTHY_BACKOFF
+
 
 def test_chain_registry_can_supply_first_endpoint(monkeypatch):
     def fake_get(url, params=None, timeout=3):
@@ -105,7 +197,7 @@ def test_chain_registry_can_supply_first_endpoint(monkeypatch):
             return DummyResponse({'ok': 1})
         pytest.fail(f'Unexpected URL {url}')
 
-    monkeypatch.setattr(requests, 'get', fake_get)
+    patch_get(monkeypatch, fake_get)
     client = RESTClient(
         '',
         'test-1',
@@ -115,3 +207,39 @@ def test_chain_registry_can_supply_first_endpoint(monkeypatch):
     assert client.health() is True
     assert client.endpoint == 'http://fb1'
     assert client.query('/foo') == {'ok': 1}
+
+
+def test_recent_successful_query_skips_health_probe(monkeypatch):
+    calls = {"node_info": 0}
+
+    def fake_get(url, params=None, timeout=3):
+        if url.endswith('/cosmos/base/tendermint/v1beta1/node_info'):
+            calls["node_info"] += 1
+            return DummyResponse({'default_node_info': {'network': 'test-1'}})
+        return DummyResponse({'ok': 1})
+
+    patch_get(monkeypatch, fake_get)
+    client = RESTClient('http://primary', 'test-1', 'testchain')
+    assert client.health() is True
+    assert client.query('/foo') == {'ok': 1}
+    assert client.health() is True
+    assert calls["node_info"] == 1
+
+    client.health_ttl = 0
+    assert client.health() is True
+    assert calls["node_info"] == 2
+
+
+def test_retry_after_is_capped():
+    retry = _BoundedRetry(total=2, status_forcelist=(429,))
+    assert retry.get_retry_after(HTTPResponse(status=429, headers={'Retry-After': '120'})) == MAX_RETRY_AFTER
+    assert retry.get_retry_after(HTTPResponse(status=429, headers={'Retry-After': '1'})) == 1
+    assert retry.get_retry_after(HTTPResponse(status=429)) is None
+
+
+def test_only_gateway_statuses_are_retried_in_place():
+    client = RESTClient('http://primary', 'test-1', 'testchain')
+    retry = client._session.get_adapter('http://primary').max_retries
+    assert isinstance(retry, _BoundedRetry)
+    assert (retry.connect, retry.read, retry.other, retry.status) == (0, 0, 0, 2)
+    assert 503 in retry.status_forcelist and 404 not in retry.status_forcelist
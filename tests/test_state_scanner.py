@@ -1,4 +1,7 @@
+import threading
+
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from ibc_monitor.state_scanner import StateScanner
 from requests.exceptions import HTTPError
 from requests import Response
@@ -61,6 +64,30 @@ def test_scan_all(scanner):
     assert scanner.channel_state_map[('unused', 'conn1', 'p', 'c')] == 'unknown'
 
 
+def test_scan_with_executor_matches_sequential_scan(scanner):
+    scanner.scan()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        parallel = StateScanner(scanner.rest, DummyCfg(), ['cp'], executor=pool)
+        parallel.scan()
+    assert parallel.clients == scanner.clients
+    assert parallel.connections == scanner.connections
+    assert parallel.channels == scanner.channels
+    assert parallel.client_status_map == scanner.client_status_map
+
+
+def test_scan_reuses_result_within_refresh_interval(scanner):
+    calls = []
+    query = scanner.rest.query
+    scanner.rest.query = lambda path, params=None, timeout=None: calls.append(path) or query(path, params, timeout)
+    scanner.cfg.state_refresh_interval = 60
+    assert scanner.scan()
+    first = len(calls)
+    assert first > 0
+    assert scanner.scan()
+    assert len(calls) == first
+    assert sorted(scanner.clients) == ['c1', 'c2']
+
+
 class DummyClientWith404(DummyClient):
     def __init__(self, data, error_paths):
         super().__init__(data)
@@ -168,6 +195,21 @@ def test_scan_fails_on_repeated_pagination_key():
     assert scanner.last_scan == 0
 
 
+def test_client_filter_allow_deny(scanner):
+    class FilteredCfg(DummyCfg):
+        blacklist_clients = ['c2']
+
+    denied = StateScanner(scanner.rest, FilteredCfg(), ['cp'])
+    denied.scan()
+    assert denied.clients == ['c1']
+
+    FilteredCfg.whitelist_clients = ['c2']
+    allowed = StateScanner(scanner.rest, FilteredCfg(), ['cp'])
+    allowed.scan()
+    assert allowed.clients == ['c2']
+    assert allowed.connections == []
+
+
 def test_omit_inactive_clients():
     data = {
         '/ibc/core/client/v1/client_states': {
@@ -230,3 +272,118 @@ def test_omit_closed_channels():
     assert scanner.scan() is True
     assert scanner.channels == [('conn1', 'p', 'open', 'cp', 'cc-open', 'cp')]
     assert scanner.channel_state_map == {('unused', 'conn1', 'p', 'open'): 'open'}
+
+
+def test_counterparty_channels_scanned_across_chains_in_parallel():
+    home = DummyClient({
+        '/ibc/core/client/v1/client_states': {
+            'client_states': [
+                {'client_id': 'c1', 'client_state': {'chain_id': 'cp-a'}},
+                {'client_id': 'c2', 'client_state': {'chain_id': 'cp-b'}},
+            ]
+        },
+        '/ibc/core/connection/v1/client_connections/c1': {'connection_paths': ['conn1']},
+        '/ibc/core/connection/v1/client_connections/c2': {'connection_paths': ['conn2']},
+        '/ibc/core/connection/v1/connections/conn1': {
+            'connection': {'counterparty': {'client_id': 'x1', 'connection_id': 'cp-conn1'}}
+        },
+        '/ibc/core/connection/v1/connections/conn2': {
+            'connection': {'counterparty': {'client_id': 'x2', 'connection_id': 'cp-conn2'}}
+        },
+    })
+    rest_by_chain = {
+        chain: DummyClient({
+            f'/ibc/core/channel/v1/connections/cp-{conn}/channels': {
+                'channels': [{'port_id': 'p', 'channel_id': f'{chain}-ch', 'counterparty': {'port_id': 'p', 'channel_id': 'h'}}]
+            },
+            f'/ibc/core/client/v1/client_status/{client}': {'status': 'Active'},
+        })
+        for chain, conn, client in (('cp-a', 'conn1', 'x1'), ('cp-b', 'conn2', 'x2'))
+    }
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        scanner = StateScanner(home, DummyCfg(), ['cp-a', 'cp-b'], rest_by_chain=rest_by_chain, executor=pool)
+        assert scanner.scan() is True
+
+    assert scanner.cp_connections == {'cp-a': ['cp-conn1'], 'cp-b': ['cp-conn2']}
+    assert scanner.cp_client_status_map == {('cp-a', 'x1'): 'active', ('cp-b', 'x2'): 'active'}
+    assert scanner.cp_channels == [
+        ('cp-a', 'cp-conn1', 'p', 'cp-a-ch', 'p', 'h', 'unused'),
+        ('cp-b', 'cp-conn2', 'p', 'cp-b-ch', 'p', 'h', 'unused'),
+    ]
+
+
+def test_shared_connection_fetched_once():
+    class RecordingClient(DummyClient):
+        def __init__(self, data):
+            super().__init__(data)
+            self.paths = []
+
+        def query(self, path, params=None, timeout=None):
+            self.paths.append(path)
+            return super().query(path, params, timeout)
+
+    client = RecordingClient({
+        '/ibc/core/client/v1/client_states': {
+            'client_states': [
+                {'client_id': 'c1', 'client_state': {'chain_id': 'cp'}},
+                {'client_id': 'c2', 'client_state': {'chain_id': 'cp'}},
+            ]
+        },
+        '/ibc/core/connection/v1/client_connections/c1': {'connection_paths': ['conn1']},
+        '/ibc/core/connection/v1/client_connections/c2': {'connection_paths': ['conn1']},
+    })
+    scanner = StateScanner(client, DummyCfg(), ['cp'])
+    assert scanner.scan() is True
+    assert client.paths.count('/ibc/core/connection/v1/connections/conn1') == 1
+
+
+def test_background_scan_hands_over_results(scanner):
+    scanner.start_background()
+    try:
+        assert scanner.scan() is True
+        assert scanner.connections == ['conn1']
+        assert ('conn1', 'p', 'c', 'cp', 'cc', 'cp') in scanner.channels
+        # no newer result yet: keep serving the published topology
+        assert scanner.scan() is True
+        assert scanner.connections == ['conn1']
+    finally:
+        scanner.stop_background()
+
+
+def test_background_scan_failed_first_scan_is_not_success():
+    class FailingClient(DummyClient):
+        def query(self, path, params=None, timeout=None):
+            raise RuntimeError("boom")
+
+    cfg = DummyCfg()
+    cfg.state_refresh_interval = 60
+    scanner = StateScanner(FailingClient({}), cfg, ['cp'])
+    scanner.start_background()
+    try:
+        assert scanner.scan(timeout=5) is False
+        # the failed result was consumed; with nothing published yet this is still a failure
+        assert scanner.scan(timeout=5) is False
+        assert scanner.clients == []
+    finally:
+        scanner.stop_background(timeout=5)
+    assert scanner._background is None
+
+
+def test_background_scan_first_wait_is_bounded(scanner):
+    release = threading.Event()
+    query = scanner.rest.query
+
+    def slow_query(path, params=None, timeout=None):
+        release.wait(5)
+        return query(path, params, timeout)
+
+    scanner.rest.query = slow_query
+    scanner.start_background()
+    try:
+        assert scanner.scan(timeout=0.05) is False
+        release.set()
+        assert scanner.scan(timeout=5) is True
+        assert scanner.connections == ['conn1']
+    finally:
+        scanner.stop_background(timeout=5)